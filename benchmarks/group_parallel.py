@@ -0,0 +1,96 @@
+"""
+Benchmark `transcript-group --workers N` against the sequential path.
+
+Generates a synthetic slimmed transcript, groups it sequentially and with 2, 4, ...
+worker processes (up to the CPU count), checks the output is byte-identical to the
+sequential output, and prints the speedup for each worker count.
+
+    uv run python benchmarks/group_parallel.py --segments 1000000
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from transcript_tools.grouping import group_consecutive_segments_file
+
+
+WORDS = (
+    "the of and to a in is you that it he was for on are as with his they at "
+    "be this have from or one had by word but not what all were we when your "
+    "can said there use an each which she do how their if will up other about"
+).split()
+
+
+def _make_segments(count: int, speakers: int, seed: int) -> list[dict[str, str]]:
+    rng = random.Random(seed)
+    names = [f"Speaker {i}" for i in range(speakers)]
+    speaker = names[0]
+    segments = []
+    for _ in range(count):
+        # Speakers tend to hold the floor for a few segments at a time.
+        if rng.random() < 0.3:
+            speaker = rng.choice(names)
+        text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 30)))
+        segments.append({"text": text, "speaker": speaker})
+    return segments
+
+
+def _time_grouping(input_path: Path, output_path: Path, workers: int, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        group_consecutive_segments_file(input_path, output_path, workers=workers)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--segments", type=int, default=500_000)
+    parser.add_argument("--speakers", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    counts = [2]
+    while counts[-1] * 2 <= cpus:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != cpus and cpus > 2:
+        counts.append(cpus)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        input_path = tmp_dir / "bench.slim.json"
+        with input_path.open("w", encoding="utf-8") as f:
+            json.dump(
+                {"segments": _make_segments(args.segments, args.speakers, args.seed)},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+
+        baseline_path = tmp_dir / "sequential.group.json"
+        baseline = _time_grouping(input_path, baseline_path, 1, args.repeat)
+        expected = baseline_path.read_bytes()
+
+        print(f"{args.segments} segments, {cpus} CPU(s), best of {args.repeat}")
+        print(f"{'workers':>7}  {'seconds':>8}  {'speedup':>7}")
+        print(f"{'seq':>7}  {baseline:8.3f}  {1.0:7.2f}")
+
+        for workers in counts:
+            output_path = tmp_dir / f"parallel-{workers}.group.json"
+            elapsed = _time_grouping(input_path, output_path, workers, args.repeat)
+            if output_path.read_bytes() != expected:
+                raise SystemExit(f"output with {workers} worker(s) differs from sequential")
+            print(f"{workers:>7}  {elapsed:8.3f}  {baseline / elapsed:7.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+from __future__ import annotations
+
+import random
+import unittest
+
+from transcript_tools.cleanup import Lexicon, parse_lexicon
+
+
+def _lexicon() -> Lexicon:
+    return Lexicon(
+        parse_lexicon(
+            {
+                "remove": ["um", "uh", "like,", "you know"],
+                "replace": {"rust c": "rustc", "jan david noes": "Jan David Nose"},
+            }
+        )
+    )
+
+
+class LexiconApplyTest(unittest.TestCase):
+    def assertCleaned(self, cases: dict[str, str]) -> None:
+        lexicon = _lexicon()
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                self.assertEqual(lexicon.apply(text), expected)
+
+    def test_filler_between_commas_takes_both_commas(self) -> None:
+        self.assertCleaned(
+            {
+                "It was, uh, great.": "It was great.",
+                "We, you know, shipped it.": "We shipped it.",
+                "I was, like, thinking": "I was thinking",
+                "I, um, think": "I think",
+                "So, um, I think": "So I think",
+                "It was, uh, um, great.": "It was great.",
+                "It was, uh,great": "It was great",
+            }
+        )
+
+    def test_filler_at_start_or_end(self) -> None:
+        self.assertCleaned(
+            {
+                "Um, so I think": "So I think",
+                "Yes. Uh, we did.": "Yes. We did.",
+                "yes, uh": "yes",
+                "Done. Um": "Done.",
+                "It was uh, great.": "It was great.",
+            }
+        )
+
+    def test_filler_inside_quotes_and_brackets(self) -> None:
+        self.assertCleaned(
+            {
+                'He said "um, no".': 'He said "no".',
+                "(um) okay": "okay",
+                "(um, yes)": "(yes)",
+                "It was, uh, (great)": "It was (great)",
+                "it, (uh), we.": "it we.",
+                'it um "you know".': "it.",
+                'He said "um" ok': "He said ok",
+            }
+        )
+
+    def test_replacements_and_hit_counts(self) -> None:
+        lexicon = _lexicon()
+        self.assertEqual(
+            lexicon.apply("Um, Rust C and RUST C, says jan david noes."),
+            "Rustc and RUSTC, says Jan David Nose.",
+        )
+        hits = {rule.pattern: rule.hits for rule in lexicon.rules}
+        self.assertEqual(hits["um"], 1)
+        self.assertEqual(hits["rust c"], 2)
+        self.assertEqual(hits["jan david noes"], 1)
+
+    def test_no_punctuation_debris(self) -> None:
+        lexicon = _lexicon()
+        words = ["we", "shipped", "it", "great", "so", "the", "build"]
+        fillers = ["um", "uh", "like,", "you know"]
+        pairs = [("(", ")"), ('"', '"'), ("“", "”"), ("", "")]
+        debris = ["  ", " ,", ",,", ",.", " .", "()", '""', "“”", "( ", " )", "(,", ",)"]
+        rng = random.Random(0)
+        for _ in range(5000):
+            # Well-formed text: words and fillers, some followed by a comma,
+            # with one span in brackets or quotes.
+            tokens = []
+            for _ in range(rng.randint(1, 6)):
+                tokens.append(rng.choice(fillers if rng.random() < 0.4 else words))
+                if rng.random() < 0.3 and not tokens[-1].endswith(","):
+                    tokens[-1] += ","
+            tokens[-1] = tokens[-1].rstrip(",")
+            first = rng.randrange(len(tokens))
+            last = rng.randrange(first, len(tokens))
+            opener, closer = rng.choice(pairs)
+            tokens[first] = opener + tokens[first]
+            if tokens[last].endswith(","):
+                tokens[last] = tokens[last][:-1] + closer + ","
+            else:
+                tokens[last] += closer
+            text = " ".join(tokens) + "."
+
+            cleaned = lexicon.apply(text)
+            with self.subTest(text=text, cleaned=cleaned):
+                for chars in debris:
+                    self.assertNotIn(chars, cleaned)
+                self.assertFalse(cleaned.startswith((",", ".", " ")))
+
+
+if __name__ == "__main__":
+    unittest.main()
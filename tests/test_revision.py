@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import io
+import json
+import re
+import tempfile
+import threading
+import time
+import unittest
+from contextlib import redirect_stderr
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from transcript_tools import revision_cli
+from transcript_tools.revision import (
+    RevisionConfig,
+    chunk_paragraphs,
+    paragraphs_from_groups,
+    revise_markdown_from_json,
+)
+
+
+_LABEL_RE = re.compile(r"^\*\*(.*?)\*\*:\s*")
+
+
+class _StubState:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = 0
+        self.failed_once: set[str] = set()
+        self.fail_all = False
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """
+    An OpenAI-compatible chat completions stub. It upper-cases every
+    paragraph and mangles the speaker labels. A chunk containing "FLAKY"
+    fails with a 500 the first time it is sent; with 'fail_all' set, every
+    request does.
+    """
+
+    state: _StubState
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_POST(self) -> None:
+        length = int(self.headers["Content-Length"])
+        payload = json.loads(self.rfile.read(length))
+        text = payload["messages"][-1]["content"]
+
+        state = self.state
+        with state.lock:
+            state.requests += 1
+            state.in_flight += 1
+            state.max_in_flight = max(state.max_in_flight, state.in_flight)
+            fail = state.fail_all or ("FLAKY" in text and text not in state.failed_once)
+            if fail:
+                state.failed_once.add(text)
+        # Long enough for concurrent requests to overlap. The request stops
+        # counting as in flight before the reply goes out, since the client
+        # may send its next request as soon as it has the reply.
+        time.sleep(0.1)
+        with state.lock:
+            state.in_flight -= 1
+
+        if fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+
+        revised = []
+        for i, paragraph in enumerate(text.split("\n\n")):
+            body = _LABEL_RE.sub("", paragraph).upper()
+            # Drop the label from some paragraphs, rename it on others.
+            revised.append(body if i % 2 else f"**Somebody Else**: {body}")
+        content = "```markdown\n" + "\n\n".join(revised) + "\n```"
+
+        reply = json.dumps({"choices": [{"message": {"content": content}}]})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(reply.encode("utf-8"))
+
+
+class RevisionTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.state = _StubState()
+        handler = type("Handler", (_StubHandler,), {"state": self.state})
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.endpoint = f"http://127.0.0.1:{self.server.server_address[1]}/v1"
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+
+    def tearDown(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def _write_groups(self, count: int) -> Path:
+        groups = [
+            {
+                "speaker": "Alice" if i % 2 else "Bob",
+                "segments": [f"paragraph {i} says something.", "FLAKY" if i == 7 else "ok."],
+            }
+            for i in range(count)
+        ]
+        path = self.dir / "input.json"
+        path.write_text(json.dumps({"segments": groups}), encoding="utf-8")
+        return path
+
+    def test_revises_chunks_concurrently_and_reassembles(self) -> None:
+        input_path = self._write_groups(20)
+        output_path = self.dir / "output.md"
+        config = RevisionConfig(
+            endpoint=self.endpoint,
+            model="stub",
+            max_tokens=40,
+            overlap_tokens=15,
+            concurrency=3,
+            retries=2,
+        )
+
+        problems = revise_markdown_from_json(input_path, output_path, config)
+
+        paragraphs = output_path.read_text(encoding="utf-8").rstrip("\n").split("\n\n")
+        self.assertEqual(len(paragraphs), 20)
+        for i, paragraph in enumerate(paragraphs):
+            speaker = "Alice" if i % 2 else "Bob"
+            # Original labels are restored; each paragraph appears exactly once,
+            # in order, despite the overlapping chunks.
+            self.assertTrue(paragraph.startswith(f"**{speaker}**: PARAGRAPH {i} SAYS"), paragraph)
+
+        # Chunks overlap, so more paragraphs were sent than exist.
+        chunks = chunk_paragraphs(
+            paragraphs_from_groups(json.loads(input_path.read_text())["segments"]), 40, 15
+        )
+        self.assertGreater(len(chunks), 3)
+        self.assertTrue(all(chunk.overlap > 0 for chunk in chunks[1:]))
+
+        # Requests ran in parallel, but never more than 'concurrency' at once.
+        self.assertGreater(self.state.max_in_flight, 1)
+        self.assertLessEqual(self.state.max_in_flight, 3)
+
+        # Every chunk containing the flaky paragraph failed once, then succeeded.
+        self.assertTrue(problems)
+        for chunk, errors in problems:
+            self.assertIsNotNone(chunk.revised)
+            self.assertEqual(len(errors), 1)
+            self.assertIn("500", errors[0])
+        self.assertEqual(self.state.requests, len(chunks) + len(problems))
+
+    def test_failed_chunks_write_nothing_unless_partial_allowed(self) -> None:
+        self.state.fail_all = True
+        input_path = self._write_groups(4)
+        output_path = self.dir / "output.md"
+        argv = [
+            str(input_path),
+            str(output_path),
+            "--endpoint",
+            self.endpoint,
+            "--model",
+            "stub",
+            "--retries",
+            "0",
+        ]
+
+        with redirect_stderr(io.StringIO()) as stderr:
+            with self.assertRaises(SystemExit) as raised:
+                revision_cli.main(argv)
+        self.assertEqual(raised.exception.code, 1)
+        self.assertIn("--allow-partial", stderr.getvalue())
+        self.assertFalse(output_path.exists())
+
+        with redirect_stderr(io.StringIO()):
+            revision_cli.main(argv + ["--allow-partial"])
+        self.assertTrue(
+            output_path.read_text(encoding="utf-8").startswith("**Bob**: paragraph 0 says")
+        )
+
+    def test_rejects_overlap_of_half_a_chunk_or_more(self) -> None:
+        with self.assertRaises(ValueError):
+            RevisionConfig(endpoint=self.endpoint, model="stub", max_tokens=300, overlap_tokens=300)
+        with self.assertRaises(ValueError):
+            RevisionConfig(endpoint=self.endpoint, model="stub", max_tokens=300, overlap_tokens=150)
+        with self.assertRaises(ValueError):
+            chunk_paragraphs([], 300, 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
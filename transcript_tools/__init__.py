@@ -2,6 +2,7 @@ from .segments import transform_segments, transform_segments_file
 from .grouping import (
     group_consecutive_segments,
     group_consecutive_segments_file,
+    group_consecutive_segments_parallel,
 )
 
 __all__ = [
@@ -9,4 +10,5 @@ __all__ = [
     "transform_segments_file",
     "group_consecutive_segments",
     "group_consecutive_segments_file",
+    "group_consecutive_segments_parallel",
 ]
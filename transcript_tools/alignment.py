@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_left
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .ndjson import RecordWriter
+
+
+_TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+_LABEL_RE = re.compile(r"^\*\*(.*?)\*\*:\s*", re.DOTALL)
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Gaps between anchors up to this many DP cells are aligned exactly; larger
+# ones are first split further on words that occur once on each side.
+_MAX_GAP_CELLS = 4_000_000
+
+_MATCH, _MISMATCH, _GAP = 2, -1, -1
+
+
+@dataclass
+class TimedWord:
+    word: str
+    start: Optional[float]
+    end: Optional[float]
+
+
+def _key(word: str) -> str:
+    """Comparison key: lowercase word characters only."""
+    return "".join(_TOKEN_RE.findall(word.lower()))
+
+
+def parse_markdown_paragraphs(markdown: str) -> List[Tuple[str, str]]:
+    """
+    (speaker, text) for each paragraph of a `transcript-md` style transcript.
+    """
+    paragraphs: List[Tuple[str, str]] = []
+    for block in _PARAGRAPH_SPLIT_RE.split(markdown.strip()):
+        block = " ".join(block.split())
+        if not block:
+            continue
+        m = _LABEL_RE.match(block)
+        if m:
+            paragraphs.append((m.group(1).strip(), block[m.end() :]))
+        else:
+            paragraphs.append(("", block))
+    return paragraphs
+
+
+def load_whisperx_words(path: str | Path) -> List[TimedWord]:
+    """
+    All words of a whisperX JSON file, in order, from each segment's 'words'
+    array. Words whisperX couldn't time keep start/end None.
+    """
+    with Path(path).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    segments = data.get("segments")
+    if not isinstance(segments, list):
+        raise ValueError(
+            f"Expected top-level key 'segments' containing a list; "
+            f"got {type(segments)!r}"
+        )
+
+    words: List[TimedWord] = []
+    for seg in segments:
+        raw_words = seg.get("words") if isinstance(seg, dict) else None
+        if not isinstance(raw_words, list):
+            raise ValueError(
+                "Every segment needs a 'words' array; run whisperX with word "
+                "alignment enabled."
+            )
+        for w in raw_words:
+            start, end = w.get("start"), w.get("end")
+            words.append(
+                TimedWord(
+                    word=str(w.get("word", "")),
+                    start=float(start) if isinstance(start, (int, float)) else None,
+                    end=float(end) if isinstance(end, (int, float)) else None,
+                )
+            )
+    return words
+
+
+def _unique_ngram_anchors(
+    a: Sequence[str],
+    b: Sequence[str],
+    n: int,
+) -> List[Tuple[int, int]]:
+    """
+    Positions (i, j) where the same n-gram occurs exactly once in 'a' and
+    once in 'b', reduced to the longest chain increasing in both (patience
+    diff style). O(len log len).
+    """
+
+    def unique_positions(seq: Sequence[str]) -> Dict[Tuple[str, ...], int]:
+        seen: Dict[Tuple[str, ...], int] = {}
+        for i in range(len(seq) - n + 1):
+            gram = tuple(seq[i : i + n])
+            if "" in gram:
+                continue
+            seen[gram] = -1 if gram in seen else i
+        return {g: i for g, i in seen.items() if i >= 0}
+
+    in_b = unique_positions(b)
+    pairs = [(i, in_b[g]) for g, i in unique_positions(a).items() if g in in_b]
+    pairs.sort()
+
+    # Longest increasing subsequence on j.
+    tails: List[int] = []
+    tail_idx: List[int] = []
+    prev: List[int] = [-1] * len(pairs)
+    for k, (_, j) in enumerate(pairs):
+        pos = bisect_left(tails, j)
+        if pos == len(tails):
+            tails.append(j)
+            tail_idx.append(k)
+        else:
+            tails[pos] = j
+            tail_idx[pos] = k
+        prev[k] = tail_idx[pos - 1] if pos else -1
+
+    chain: List[Tuple[int, int]] = []
+    k = tail_idx[-1] if tail_idx else -1
+    while k >= 0:
+        chain.append(pairs[k])
+        k = prev[k]
+    chain.reverse()
+    return chain
+
+
+def _nw_last_row(a: Sequence[str], b: Sequence[str]) -> List[int]:
+    """Needleman-Wunsch scores of a against every prefix of b, O(len b) memory."""
+    row = [j * _GAP for j in range(len(b) + 1)]
+    for x in a:
+        prev_diag, row[0] = row[0], row[0] + _GAP
+        for j, y in enumerate(b, start=1):
+            score = max(
+                prev_diag + (_MATCH if x == y else _MISMATCH),
+                row[j] + _GAP,
+                row[j - 1] + _GAP,
+            )
+            prev_diag, row[j] = row[j], score
+    return row
+
+
+def _hirschberg(
+    a: Sequence[str],
+    b: Sequence[str],
+    a_off: int,
+    b_off: int,
+    out: List[Tuple[int, int]],
+) -> None:
+    """
+    Global alignment in linear memory; appends aligned (i, j) pairs, matches
+    and substitutions alike, to 'out' in order.
+    """
+    if not a or not b:
+        return
+    if len(a) == 1 or len(b) == 1:
+        # Pair the single word with its best counterpart, if pairing beats
+        # leaving everything unaligned.
+        if len(a) == 1:
+            j = next((j for j, y in enumerate(b) if y == a[0]), 0)
+            if b[j] == a[0] or len(b) == 1:
+                out.append((a_off, b_off + j))
+        else:
+            i = next((i for i, x in enumerate(a) if x == b[0]), 0)
+            if a[i] == b[0] or len(a) == 1:
+                out.append((a_off + i, b_off))
+        return
+
+    mid = len(a) // 2
+    left = _nw_last_row(a[:mid], b)
+    right = _nw_last_row(a[mid:][::-1], b[::-1])
+    split = max(range(len(b) + 1), key=lambda j: left[j] + right[len(b) - j])
+
+    _hirschberg(a[:mid], b[:split], a_off, b_off, out)
+    _hirschberg(a[mid:], b[split:], a_off + mid, b_off + split, out)
+
+
+def _align_gap(
+    a: Sequence[str],
+    b: Sequence[str],
+    a_off: int,
+    b_off: int,
+    out: List[Tuple[int, int]],
+) -> None:
+    if not a or not b:
+        return
+    if len(a) * len(b) <= _MAX_GAP_CELLS:
+        _hirschberg(a, b, a_off, b_off, out)
+        return
+
+    anchors = _unique_ngram_anchors(a, b, 1)
+    if not anchors:
+        # Nothing to hold on to; these words get interpolated timings.
+        return
+    _align_between_anchors(a, b, anchors, 1, a_off, b_off, out)
+
+
+def _align_between_anchors(
+    a: Sequence[str],
+    b: Sequence[str],
+    anchors: Sequence[Tuple[int, int]],
+    n: int,
+    a_off: int,
+    b_off: int,
+    out: List[Tuple[int, int]],
+) -> None:
+    last_i, last_j = -1, -1
+    for i, j in anchors:
+        for k in range(n):
+            if i + k <= last_i or j + k <= last_j:
+                continue
+            _align_gap(
+                a[last_i + 1 : i + k], b[last_j + 1 : j + k],
+                a_off + last_i + 1, b_off + last_j + 1, out,
+            )
+            out.append((a_off + i + k, b_off + j + k))
+            last_i, last_j = i + k, j + k
+    _align_gap(a[last_i + 1 :], b[last_j + 1 :], a_off + last_i + 1, b_off + last_j + 1, out)
+
+
+def align_words(revised: Sequence[str], original: Sequence[str]) -> List[Tuple[int, int]]:
+    """
+    Align two word sequences (by `_key`) and return the aligned (revised,
+    original) index pairs, increasing in both.
+
+    Words that are unique trigrams on both sides anchor the alignment; the
+    stretches between anchors are aligned with Hirschberg's algorithm, so time
+    stays close to linear for similar texts and memory stays linear always.
+    """
+    a = [_key(w) for w in revised]
+    b = [_key(w) for w in original]
+    out: List[Tuple[int, int]] = []
+    _align_between_anchors(a, b, _unique_ngram_anchors(a, b, 3), 3, 0, 0, out)
+    return out
+
+
+def _fill_timings(timings: List[Optional[Tuple[float, float]]]) -> List[Tuple[float, float]]:
+    """
+    Give untimed words times spread evenly between their timed neighbours.
+    """
+    filled: List[Tuple[float, float]] = []
+    n = len(timings)
+    i = 0
+    prev_end = next((t[0] for t in timings if t is not None), 0.0)
+    while i < n:
+        timing = timings[i]
+        if timing is not None:
+            filled.append(timing)
+            prev_end = timing[1]
+            i += 1
+            continue
+
+        run_end = i
+        while run_end < n and timings[run_end] is None:
+            run_end += 1
+        next_timing = timings[run_end] if run_end < n else None
+        next_start = next_timing[0] if next_timing is not None else prev_end
+        step = max(0.0, next_start - prev_end) / (run_end - i)
+        for k in range(run_end - i):
+            filled.append((prev_end + k * step, prev_end + (k + 1) * step))
+        i = run_end
+    return filled
+
+
+def align_markdown_to_words(
+    paragraphs: Sequence[Tuple[str, str]],
+    original: Sequence[TimedWord],
+) -> Tuple[List[Dict[str, Any]], float]:
+    """
+    Timestamp revised (speaker, text) paragraphs using whisperX word timings.
+
+    Returns grouped segments ({speaker, segments, start, end, words}, one per
+    paragraph, with 'segments' split into sentences) and the fraction of
+    revised words that were aligned to an original word.
+    """
+    revised: List[str] = [w for _, text in paragraphs for w in text.split()]
+
+    timings: List[Optional[Tuple[float, float]]] = [None] * len(revised)
+    pairs = align_words(revised, [w.word for w in original])
+    for i, j in pairs:
+        start, end = original[j].start, original[j].end
+        if start is not None and end is not None:
+            timings[i] = (start, end)
+    filled = _fill_timings(timings)
+
+    groups: List[Dict[str, Any]] = []
+    pos = 0
+    for speaker, text in paragraphs:
+        count = len(text.split())
+        words = [
+            {"word": revised[k], "start": round(filled[k][0], 3), "end": round(filled[k][1], 3)}
+            for k in range(pos, pos + count)
+        ]
+        pos += count
+        group: Dict[str, Any] = {
+            "speaker": speaker,
+            "segments": [s for s in _SENTENCE_SPLIT_RE.split(text) if s],
+        }
+        if words:
+            group["start"] = words[0]["start"]
+            group["end"] = words[-1]["end"]
+        group["words"] = words
+        groups.append(group)
+
+    coverage = len(pairs) / len(revised) if revised else 1.0
+    return groups, coverage
+
+
+def align_markdown_file(
+    markdown_path: str | Path,
+    whisperx_path: str | Path,
+    output_path: str | Path,
+) -> float:
+    """
+    Align a revised markdown transcript with the original whisperX JSON and
+    write a timestamped grouped JSON ('-' for NDJSON on stdout). Returns the
+    aligned word fraction.
+    """
+    markdown = Path(markdown_path).read_text(encoding="utf-8")
+    paragraphs = parse_markdown_paragraphs(markdown)
+    original = load_whisperx_words(whisperx_path)
+
+    groups, coverage = align_markdown_to_words(paragraphs, original)
+
+    with RecordWriter(output_path) as writer:
+        writer.write_all(groups)
+    return coverage
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .alignment import align_markdown_file
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="transcript-align",
+        description=(
+            "Re-attach word timestamps to a revised markdown transcript by "
+            "aligning it with the original whisperX JSON, producing a "
+            "timestamped grouped JSON (e.g. for transcript-export captions)."
+        ),
+    )
+    parser.add_argument(
+        "markdown",
+        type=Path,
+        help="Path to the revised markdown transcript (**Speaker**: text paragraphs).",
+    )
+    parser.add_argument(
+        "whisperx",
+        type=Path,
+        help="Path to the original whisperX JSON file, with per-word timings.",
+    )
+    parser.add_argument(
+        "output",
+        type=Path,
+        help="Path to write the grouped JSON to, or '-' for NDJSON on stdout.",
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        coverage = align_markdown_file(args.markdown, args.whisperx, args.output)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    print(
+        f"aligned {coverage:.1%} of revised words to the original; the rest got interpolated timings",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,412 @@
+from __future__ import annotations
+
+import json
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .ndjson import RecordWriter, iter_records
+
+
+_SENTENCE_END = ".!?"
+_JOIN_PUNCTUATION = ",.;:!?"
+# Brackets and quotes, by opener. A straight '"' opens or closes depending on
+# what's around it.
+_PAIRS = {"(": ")", "[": "]", "{": "}", '"': '"', "“": "”", "‘": "’"}
+_CLOSERS = set(_PAIRS.values())
+# Placeholder left in the output where something was removed.
+_JOIN = "\0"
+
+
+@dataclass
+class Rule:
+    """
+    One lexicon entry: remove 'pattern' (replacement None) or replace it.
+
+    - case_sensitive: match the pattern's exact case; otherwise any case
+      matches, and the replacement follows the match's capitalization
+    - whole_word: only match where the pattern isn't part of a longer word
+    """
+
+    pattern: str
+    replacement: Optional[str] = None
+    case_sensitive: bool = False
+    whole_word: bool = True
+    hits: int = 0
+
+
+def _parse_rule(raw: Any, replacement: Optional[str] = None) -> Rule:
+    if isinstance(raw, str):
+        rule = Rule(pattern=raw, replacement=replacement)
+    elif isinstance(raw, Mapping) and isinstance(raw.get("match"), str):
+        rule = Rule(
+            pattern=raw["match"],
+            replacement=raw.get("replace"),
+            case_sensitive=bool(raw.get("case_sensitive", False)),
+            whole_word=bool(raw.get("whole_word", True)),
+        )
+    else:
+        raise ValueError(f"Invalid lexicon entry: {raw!r}")
+
+    if not rule.pattern:
+        raise ValueError("Lexicon patterns cannot be empty.")
+    if rule.replacement is not None and not isinstance(rule.replacement, str):
+        raise ValueError(f"Replacement for {rule.pattern!r} must be a string.")
+    if rule.replacement == "":
+        rule.replacement = None
+    return rule
+
+
+def parse_lexicon(raw: Any) -> List[Rule]:
+    """
+    Build rules from a lexicon like:
+
+      {
+        "remove": ["um", "uh", "like,", "you know"],
+        "replace": {"rust c": "rustc", "jan david noes": "Jan David Nose"},
+        "rules": [
+          {"match": "Go", "replace": "Golang", "case_sensitive": true},
+          {"match": "-ish", "whole_word": false}
+        ]
+      }
+
+    Entries under "rules" without a "replace" key are removals.
+    """
+    if not isinstance(raw, Mapping):
+        raise ValueError("Lexicon must be a JSON object.")
+
+    rules: List[Rule] = []
+    for pattern in raw.get("remove") or []:
+        rules.append(_parse_rule(pattern))
+
+    replace = raw.get("replace") or {}
+    if not isinstance(replace, Mapping):
+        raise ValueError("Lexicon 'replace' must be an object of pattern -> replacement.")
+    for pattern, replacement in replace.items():
+        rules.append(_parse_rule(pattern, replacement))
+
+    for entry in raw.get("rules") or []:
+        rules.append(_parse_rule(entry))
+
+    return rules
+
+
+def load_lexicon(path: str | Path) -> List[Rule]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        return parse_lexicon(json.load(f))
+
+
+def _fold(text: str) -> str:
+    """
+    Lowercase without changing the length, so offsets stay valid.
+    """
+    lowered = text.lower()
+    if len(lowered) == len(text):
+        return lowered
+    return "".join(c if len(c.lower()) != 1 else c.lower() for c in text)
+
+
+class Lexicon:
+    """
+    All rules compiled into one Aho-Corasick automaton over case-folded text,
+    so a segment is matched against every pattern in a single pass no matter
+    how many rules there are.
+    """
+
+    def __init__(self, rules: Iterable[Rule]) -> None:
+        self.rules = list(rules)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Rules whose pattern ends at each node, including via failure links.
+        self._out: List[List[int]] = [[]]
+
+        for rule_idx, rule in enumerate(self.rules):
+            node = 0
+            for ch in _fold(rule.pattern):
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(rule_idx)
+
+        # Breadth-first, so every failure target is finished before it's used.
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[child] = target if target != child else 0
+                self._out[child].extend(self._out[self._fail[child]])
+
+    def _matches(self, text: str) -> List[Tuple[int, int, int]]:
+        """
+        Leftmost-longest, non-overlapping (start, end, rule) matches.
+        """
+        folded = _fold(text)
+        goto, fail, out = self._goto, self._fail, self._out
+        candidates: List[Tuple[int, int, int]] = []
+        node = 0
+
+        for i, ch in enumerate(folded):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for rule_idx in out[node]:
+                rule = self.rules[rule_idx]
+                start, end = i + 1 - len(rule.pattern), i + 1
+                if rule.case_sensitive and text[start:end] != rule.pattern:
+                    continue
+                if rule.whole_word and not _on_word_boundaries(text, start, end):
+                    continue
+                candidates.append((start, end, rule_idx))
+
+        candidates.sort(key=lambda m: (m[0], m[0] - m[1]))
+        selected: List[Tuple[int, int, int]] = []
+        last_end = 0
+        for match in candidates:
+            if match[0] >= last_end:
+                selected.append(match)
+                last_end = match[1]
+        return selected
+
+    def apply(self, text: str) -> str:
+        """
+        Apply every rule to 'text' and count the hits on each rule.
+
+        Removals also take a directly following comma with them (and a
+        preceding one too, when they sat between two commas), and the text
+        around them is tidied: no doubled spaces, no space before punctuation,
+        no dangling comma at the end, no brackets or quotes left empty, and a
+        sentence (or quotation) that started with the removed word starts with
+        a capital again.
+        """
+        matches = self._matches(text)
+        if not matches:
+            return text
+
+        pieces: List[str] = []
+        pos = 0
+        capitalize = False
+        for start, end, rule_idx in matches:
+            if start < pos:
+                # Overlaps a comma swallowed by the previous removal.
+                continue
+            rule = self.rules[rule_idx]
+            rule.hits += 1
+            literal = text[pos:start]
+            _append_piece(pieces, literal, capitalize)
+            matched = text[start:end]
+
+            if rule.replacement is None:
+                last = _last_visible_char(pieces)
+                starts_sentence = _at_clause_start(pieces)
+                # A removed word takes its trailing comma along; a removed word
+                # part only does when the comma can't belong to the sentence.
+                if (
+                    end < len(text)
+                    and text[end] == ","
+                    and not matched.endswith(",")
+                    and (rule.whole_word or starts_sentence or last == ",")
+                ):
+                    end += 1
+                if last == "," and text[end - 1] == ",":
+                    # A parenthetical filler ("was, uh, great"): its commas
+                    # go with it.
+                    if pieces[-1] is _JOIN:
+                        pieces.pop()
+                    _drop_trailing(pieces, ", ")
+                    if pieces:
+                        pieces.append(" ")
+                capitalize = (capitalize and not literal.strip()) or (
+                    matched[:1].isupper() and starts_sentence
+                )
+                if not (pieces and pieces[-1] is _JOIN):
+                    pieces.append(_JOIN)
+            else:
+                _append_piece(pieces, _match_case(rule, matched), False)
+                capitalize = False
+            pos = end
+
+        _append_piece(pieces, text[pos:], capitalize)
+        if pieces and pieces[-1] is _JOIN:
+            # The text ended with a removal: drop what led up to it.
+            pieces.pop()
+            _drop_trailing(pieces, ", ")
+        return "".join(p for p in pieces if p is not _JOIN)
+
+
+def _on_word_boundaries(text: str, start: int, end: int) -> bool:
+    if text[start].isalnum() and start > 0 and _is_word_char(text[start - 1]):
+        return False
+    if text[end - 1].isalnum() and end < len(text) and _is_word_char(text[end]):
+        return False
+    return True
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch in "_'’"
+
+
+def _match_case(rule: Rule, matched: str) -> str:
+    replacement = rule.replacement or ""
+    if rule.case_sensitive or not replacement:
+        return replacement
+    if len(matched) > 1 and matched.isupper():
+        return replacement.upper()
+    if matched[:1].isupper() and replacement[:1].islower():
+        return replacement[:1].upper() + replacement[1:]
+    return replacement
+
+
+def _last_visible_char(pieces: List[str]) -> Optional[str]:
+    for piece in reversed(pieces):
+        if piece is _JOIN:
+            continue
+        stripped = piece.rstrip()
+        if stripped:
+            return stripped[-1]
+    return None
+
+
+def _visible_tail(pieces: List[str]) -> str:
+    """
+    The last two visible characters (after trailing whitespace) or fewer.
+    """
+    tail = ""
+    for piece in reversed(pieces):
+        if piece is _JOIN:
+            continue
+        tail = (piece + tail).rstrip() if not tail else piece + tail
+        if len(tail) >= 2:
+            break
+    return tail[-2:]
+
+
+def _opens(tail: str) -> bool:
+    """
+    Whether 'tail' ends with an opening bracket or quote.
+    """
+    if not tail or tail[-1] not in _PAIRS:
+        return False
+    # A straight quote opens when it starts the text or follows a space or
+    # another opener.
+    return tail[-1] != '"' or len(tail) == 1 or tail[-2].isspace() or tail[-2] in _PAIRS
+
+
+def _at_clause_start(pieces: List[str]) -> bool:
+    """
+    Whether the output so far ends where a sentence or quote/bracket starts.
+    """
+    tail = _visible_tail(pieces)
+    return not tail or tail[-1] in _SENTENCE_END or _opens(tail)
+
+
+def _drop_trailing(pieces: List[str], chars: str) -> None:
+    while pieces:
+        pieces[-1] = pieces[-1].rstrip(chars)
+        if pieces[-1]:
+            return
+        pieces.pop()
+
+
+def _append_piece(pieces: List[str], piece: str, capitalize: bool) -> None:
+    """
+    Append literal text after a match. Right after a removal (marked by
+    _JOIN) the join is tidied up first.
+    """
+    if pieces and pieces[-1] is _JOIN:
+        pieces.pop()
+        last = _last_visible_char(pieces)
+        head = piece.lstrip()[:2]
+        # A straight quote after a space or before a word opens a quotation
+        # instead.
+        closes = head[:1] in _CLOSERS and not (
+            head[:1] == '"' and (head[1:].isalnum() or piece[:1].isspace())
+        )
+        if closes and last is not None:
+            tail = _visible_tail(pieces)
+            if _opens(tail) and _PAIRS[tail[-1]] == head[0]:
+                # Only the removed words were inside: drop the pair, then tidy
+                # whatever follows it.
+                _drop_trailing(pieces, " ")
+                pieces[-1] = pieces[-1][:-1]
+                if not pieces[-1]:
+                    pieces.pop()
+                piece = piece.lstrip()[1:]
+                last = _last_visible_char(pieces)
+            else:
+                # The closer now follows the previous word directly.
+                _drop_trailing(pieces, ", ")
+                piece = piece.lstrip()
+        if piece.lstrip()[:1] in tuple(_JOIN_PUNCTUATION):
+            if last is None or last in _SENTENCE_END:
+                # Punctuation that only belonged to the removed words.
+                piece = piece.lstrip().lstrip(_JOIN_PUNCTUATION)
+            elif last == "," and piece.lstrip()[0] == ",":
+                # The removed words sat between two commas: both go.
+                _drop_trailing(pieces, ", ")
+                piece = " " + piece.lstrip()[1:].lstrip()
+            else:
+                # Punctuation now follows the previous word directly.
+                _drop_trailing(pieces, ", " if last == "," else " ")
+                piece = piece.lstrip()
+        if not pieces or pieces[-1][-1:].isspace() or _opens(_visible_tail(pieces)):
+            piece = piece.lstrip(" ")
+        if capitalize:
+            stripped = piece.lstrip()
+            offset = len(piece) - len(stripped)
+            piece = piece[:offset] + stripped[:1].upper() + stripped[1:]
+        if not piece:
+            # Still joining; the next piece gets tidied too.
+            pieces.append(_JOIN)
+            return
+    if piece:
+        pieces.append(piece)
+
+
+def _clean_record(lexicon: Lexicon, record: Any) -> Any:
+    if not isinstance(record, Mapping):
+        return record
+    if isinstance(record.get("segments"), list):
+        return {
+            **record,
+            "segments": [
+                lexicon.apply(s) if isinstance(s, str) else s for s in record["segments"]
+            ],
+        }
+    if isinstance(record.get("text"), str):
+        return {**record, "text": lexicon.apply(record["text"])}
+    return record
+
+
+def clean_records(lexicon: Lexicon, records: Iterable[Any]) -> Iterator[Any]:
+    """
+    Lazily apply 'lexicon' to slimmed segments ('text') or groups
+    ('segments'), leaving every other field alone.
+    """
+    for record in records:
+        yield _clean_record(lexicon, record)
+
+
+def clean_file(
+    input_path: str | Path,
+    output_path: str | Path,
+    lexicon: Lexicon,
+) -> List[Rule]:
+    """
+    Apply 'lexicon' to a slimmed or grouped JSON file (either path may be '-'
+    for NDJSON on stdin/stdout) and return the rules with their hit counts.
+    """
+    records = iter_records(input_path)
+    with RecordWriter(output_path) as writer:
+        writer.write_all(clean_records(lexicon, records))
+    return lexicon.rules
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .cleanup import Lexicon, clean_file, load_lexicon
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="transcript-clean",
+        description=(
+            "Remove filler words and fix recurring mis-transcriptions in a "
+            "slimmed or grouped transcript JSON, using a lexicon of removals "
+            "and replacements applied in a single pass per segment."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="Path to the slimmed or grouped JSON file, or '-' for NDJSON on stdin.",
+    )
+    parser.add_argument(
+        "output",
+        type=Path,
+        help="Path where the cleaned JSON will be written, or '-' for NDJSON on stdout.",
+    )
+    parser.add_argument(
+        "--lexicon",
+        type=Path,
+        required=True,
+        help=(
+            "JSON lexicon, e.g. "
+            "'{\"remove\": [\"um\", \"uh\"], \"replace\": {\"rust c\": \"rustc\"}}'. "
+            "See `transcript_tools.cleanup.parse_lexicon` for per-rule options."
+        ),
+    )
+    parser.add_argument(
+        "--all-rules",
+        action="store_true",
+        help="Also list rules that never matched in the hit count report.",
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        lexicon = Lexicon(load_lexicon(args.lexicon))
+        rules = clean_file(args.input, args.output, lexicon)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    # Report on stderr, so stdout stays clean when it carries NDJSON.
+    for rule in sorted(rules, key=lambda r: -r.hits):
+        if rule.hits or args.all_rules:
+            action = "remove" if rule.replacement is None else f"-> {rule.replacement!r}"
+            print(f"{rule.hits:6d}  {rule.pattern!r} {action}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,432 @@
+from __future__ import annotations
+
+import hashlib
+import random
+import re
+import sqlite3
+import struct
+import zlib
+from array import array
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+from .ndjson import load_document_segments
+
+
+# MinHash over word shingles, with LSH banding: two signatures become
+# candidates when all rows of any one band agree. 40 bands of 3 rows make
+# pairs with a Jaccard similarity around 0.3 and up likely candidates.
+NUM_PERM = 120
+BANDS = 40
+ROWS = NUM_PERM // BANDS
+SHINGLE_SIZE = 5
+PASSAGE_WORDS = 80
+
+_PRIME = (1 << 61) - 1
+_SEED = 0x5EED
+_TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+
+# Bumped whenever stored signatures or bucket keys change meaning.
+_SCHEMA_VERSION = 2
+
+_rng = random.Random(_SEED)
+_PERMUTATIONS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    name TEXT UNIQUE NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS passages (
+    id INTEGER PRIMARY KEY,
+    document_id INTEGER NOT NULL REFERENCES documents(id),
+    first_segment INTEGER NOT NULL,
+    last_segment INTEGER NOT NULL,
+    preview TEXT NOT NULL,
+    signature BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS buckets (
+    kind TEXT NOT NULL,
+    band INTEGER NOT NULL,
+    key INTEGER NOT NULL,
+    ref INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS buckets_lookup ON buckets (kind, band, key);
+CREATE INDEX IF NOT EXISTS passages_document ON passages (document_id);
+"""
+
+
+@dataclass
+class Passage:
+    """A window of consecutive segments, [first_segment, last_segment]."""
+
+    first_segment: int
+    last_segment: int
+    preview: str
+    signature: List[int]
+
+
+@dataclass
+class Fingerprint:
+    signature: List[int]
+    passages: List[Passage]
+
+
+@dataclass
+class DocumentMatch:
+    name: str
+    similarity: float
+
+
+@dataclass
+class PassageMatch:
+    passage: Passage
+    name: str
+    other_first_segment: int
+    other_last_segment: int
+    similarity: float
+
+
+def _word_hash(word: str) -> int:
+    return zlib.crc32(word.encode("utf-8"))
+
+
+def _shingles(words: Sequence[int]) -> set[int]:
+    """
+    Hash every SHINGLE_SIZE-word window; short texts become one shingle.
+    """
+    size = min(SHINGLE_SIZE, len(words))
+    shingles = set()
+    for i in range(len(words) - size + 1):
+        h = 0
+        for w in words[i : i + size]:
+            h = (h * 1_000_003 + w) % _PRIME
+        shingles.add(h)
+    return shingles
+
+
+def minhash(shingles: Iterable[int]) -> List[int]:
+    values = list(shingles)
+    if not values:
+        return [_PRIME] * NUM_PERM
+    return [min([(a * x + b) % _PRIME for x in values]) for a, b in _PERMUTATIONS]
+
+
+def estimate_similarity(a: Sequence[int], b: Sequence[int]) -> float:
+    """Estimated Jaccard similarity: the fraction of agreeing slots."""
+    return sum(1 for x, y in zip(a, b) if x == y) / len(a)
+
+
+_BAND = struct.Struct(f"<{ROWS}Q")
+
+
+def _band_keys(signature: Sequence[int]) -> List[int]:
+    """
+    One key per band, as a signed 64-bit int for SQLite. The keys are stored,
+    so they come from an explicit hash rather than the interpreter's hash().
+    """
+    return [
+        int.from_bytes(
+            hashlib.blake2b(
+                _BAND.pack(*signature[b * ROWS : (b + 1) * ROWS]), digest_size=8
+            ).digest(),
+            "little",
+            signed=True,
+        )
+        for b in range(BANDS)
+    ]
+
+
+def segment_texts(segments: Sequence[Any]) -> List[str]:
+    """
+    Segment texts of a slimmed ({text}) or grouped ({segments: [...]})
+    transcript, flattened in order.
+    """
+    texts: List[str] = []
+    for item in segments:
+        if not isinstance(item, Mapping):
+            continue
+        if isinstance(item.get("segments"), list):
+            texts.extend(str(s) for s in item["segments"])
+        else:
+            texts.append(str(item.get("text", "")))
+    return texts
+
+
+def fingerprint(texts: Sequence[str]) -> Fingerprint:
+    """
+    MinHash signatures for passages of about PASSAGE_WORDS words, starting
+    every half passage so a shared stretch of text fully covers at least one
+    passage on each side. The document signature is the slot-wise minimum of
+    the passage signatures, i.e. the MinHash of all their shingles together.
+    """
+    words_per_segment = [
+        [_word_hash(m.group().lower()) for m in _TOKEN_RE.finditer(text)] for text in texts
+    ]
+
+    # Passage boundaries: segment indices where each window starts.
+    starts: List[int] = [0]
+    count = 0
+    for idx, words in enumerate(words_per_segment):
+        count += len(words)
+        if count >= PASSAGE_WORDS // 2 and idx + 1 < len(texts):
+            starts.append(idx + 1)
+            count = 0
+
+    passages: List[Passage] = []
+    for i, first in enumerate(starts):
+        last = (starts[i + 2] if i + 2 < len(starts) else len(texts)) - 1
+        if passages and last <= passages[-1].last_segment:
+            break
+        words = [w for seg in words_per_segment[first : last + 1] for w in seg]
+        if not words:
+            continue
+        preview = " ".join(t.strip() for t in texts[first : last + 1])
+        passages.append(
+            Passage(
+                first_segment=first,
+                last_segment=last,
+                preview=preview[:80],
+                signature=minhash(_shingles(words)),
+            )
+        )
+
+    if passages:
+        signature = [min(column) for column in zip(*(p.signature for p in passages))]
+    else:
+        signature = [_PRIME] * NUM_PERM
+    return Fingerprint(signature=signature, passages=passages)
+
+
+def fingerprint_file(path: str | Path) -> Fingerprint:
+    return fingerprint(segment_texts(load_document_segments(path)))
+
+
+def _to_blob(signature: Sequence[int]) -> bytes:
+    return array("Q", signature).tobytes()
+
+
+def _from_blob(blob: bytes) -> List[int]:
+    values = array("Q")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class CorpusIndex:
+    """
+    On-disk (SQLite) LSH index of document and passage signatures. Queries
+    look up one bucket per band, so their cost depends on the number of
+    similar entries rather than on the size of the corpus.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._db = sqlite3.connect(str(path))
+        self._db.executescript(_SCHEMA)
+        (version,) = self._db.execute("PRAGMA user_version").fetchone()
+        if version < _SCHEMA_VERSION:
+            self._rebuild_buckets()
+
+    def _rebuild_buckets(self) -> None:
+        """
+        Recompute every bucket key from the stored signatures, for indexes
+        written with an older key scheme.
+        """
+        with self._db:
+            self._db.execute("DELETE FROM buckets")
+            rows: List[Tuple[str, int, int, int]] = []
+            for kind, table in (("doc", "documents"), ("passage", "passages")):
+                for ref, blob in self._db.execute(f"SELECT id, signature FROM {table}"):
+                    rows.extend(
+                        (kind, band, key, ref)
+                        for band, key in enumerate(_band_keys(_from_blob(blob)))
+                    )
+            self._db.executemany(
+                "INSERT INTO buckets (kind, band, key, ref) VALUES (?, ?, ?, ?)", rows
+            )
+            self._db.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        self._db.close()
+
+    def __enter__(self) -> "CorpusIndex":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def add(self, name: str, fp: Fingerprint) -> bool:
+        """
+        Add a document, replacing any earlier document of the same name.
+        Documents without words (no passages) aren't added, since all of them
+        would look identical; returns whether the document was added.
+        """
+        with self._db:
+            self._remove(name)
+            if not fp.passages:
+                return False
+            cur = self._db.execute(
+                "INSERT INTO documents (name, signature) VALUES (?, ?)",
+                (name, _to_blob(fp.signature)),
+            )
+            doc_id = cur.lastrowid
+            rows = [("doc", band, key, doc_id) for band, key in enumerate(_band_keys(fp.signature))]
+
+            for passage in fp.passages:
+                cur = self._db.execute(
+                    "INSERT INTO passages "
+                    "(document_id, first_segment, last_segment, preview, signature) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (
+                        doc_id,
+                        passage.first_segment,
+                        passage.last_segment,
+                        passage.preview,
+                        _to_blob(passage.signature),
+                    ),
+                )
+                rows.extend(
+                    ("passage", band, key, cur.lastrowid)
+                    for band, key in enumerate(_band_keys(passage.signature))
+                )
+
+            self._db.executemany(
+                "INSERT INTO buckets (kind, band, key, ref) VALUES (?, ?, ?, ?)", rows
+            )
+        return True
+
+    def _remove(self, name: str) -> None:
+        row = self._db.execute("SELECT id FROM documents WHERE name = ?", (name,)).fetchone()
+        if row is None:
+            return
+        doc_id = row[0]
+        self._db.execute(
+            "DELETE FROM buckets WHERE kind = 'passage' AND ref IN "
+            "(SELECT id FROM passages WHERE document_id = ?)",
+            (doc_id,),
+        )
+        self._db.execute("DELETE FROM buckets WHERE kind = 'doc' AND ref = ?", (doc_id,))
+        self._db.execute("DELETE FROM passages WHERE document_id = ?", (doc_id,))
+        self._db.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+
+    def _candidates(self, kind: str, signature: Sequence[int]) -> set[int]:
+        refs: set[int] = set()
+        for band, key in enumerate(_band_keys(signature)):
+            refs.update(
+                ref
+                for (ref,) in self._db.execute(
+                    "SELECT ref FROM buckets WHERE kind = ? AND band = ? AND key = ?",
+                    (kind, band, key),
+                )
+            )
+        return refs
+
+    def query(
+        self,
+        fp: Fingerprint,
+        exclude: Optional[str] = None,
+        document_threshold: float = 0.5,
+        passage_threshold: float = 0.3,
+    ) -> Tuple[List[DocumentMatch], List[PassageMatch]]:
+        """
+        Documents whose estimated similarity to 'fp' is at least
+        'document_threshold', and passage pairs at least 'passage_threshold'
+        similar, best first. 'exclude' skips a document by name. A document
+        without words matches nothing.
+        """
+        documents: List[DocumentMatch] = []
+        if not fp.passages:
+            return documents, []
+        for doc_id in self._candidates("doc", fp.signature):
+            name, blob = self._db.execute(
+                "SELECT name, signature FROM documents WHERE id = ?", (doc_id,)
+            ).fetchone()
+            if name == exclude:
+                continue
+            similarity = estimate_similarity(fp.signature, _from_blob(blob))
+            if similarity >= document_threshold:
+                documents.append(DocumentMatch(name=name, similarity=similarity))
+
+        passages: List[PassageMatch] = []
+        for passage in fp.passages:
+            best: Dict[str, PassageMatch] = {}
+            for ref in self._candidates("passage", passage.signature):
+                name, first, last, blob = self._db.execute(
+                    "SELECT d.name, p.first_segment, p.last_segment, p.signature "
+                    "FROM passages p JOIN documents d ON d.id = p.document_id "
+                    "WHERE p.id = ?",
+                    (ref,),
+                ).fetchone()
+                if name == exclude:
+                    continue
+                similarity = estimate_similarity(passage.signature, _from_blob(blob))
+                if similarity >= passage_threshold and (
+                    name not in best or similarity > best[name].similarity
+                ):
+                    best[name] = PassageMatch(passage, name, first, last, similarity)
+            passages.extend(best.values())
+
+        documents.sort(key=lambda m: -m.similarity)
+        return documents, passages
+
+
+def describe_matches(
+    documents: Sequence[DocumentMatch],
+    passages: Sequence[PassageMatch],
+) -> List[str]:
+    """
+    Report lines; overlapping passage matches against the same document are
+    merged into one stretch of segments.
+    """
+    lines = [
+        f"near-duplicate of {m.name} (similarity ~{m.similarity:.2f})" for m in documents
+    ]
+
+    merged: List[List[Any]] = []  # [name, first, last, other_first, other_last, best, preview]
+    for m in sorted(passages, key=lambda m: (m.name, m.passage.first_segment)):
+        prev = merged[-1] if merged else None
+        if prev and prev[0] == m.name and m.passage.first_segment <= prev[2] + 1:
+            prev[2] = max(prev[2], m.passage.last_segment)
+            prev[3] = min(prev[3], m.other_first_segment)
+            prev[4] = max(prev[4], m.other_last_segment)
+            prev[5] = max(prev[5], m.similarity)
+            continue
+        merged.append(
+            [
+                m.name,
+                m.passage.first_segment,
+                m.passage.last_segment,
+                m.other_first_segment,
+                m.other_last_segment,
+                m.similarity,
+                m.passage.preview,
+            ]
+        )
+
+    for name, first, last, other_first, other_last, similarity, preview in merged:
+        lines.append(
+            f"segments {first}-{last} shared with {name} segments "
+            f"{other_first}-{other_last} (similarity ~{similarity:.2f}): {preview!r}"
+        )
+    return lines
+
+
+def check_file(
+    index_path: str | Path,
+    input_path: str | Path,
+    add: bool = False,
+    name: Optional[str] = None,
+) -> List[str]:
+    """
+    Compare a slimmed or grouped JSON file with the corpus index at
+    'index_path' and return report lines; with 'add', also add it to the
+    index (under 'name', default the resolved path).
+    """
+    name = name or str(Path(input_path).resolve())
+    fp = fingerprint_file(input_path)
+    with CorpusIndex(index_path) as index:
+        lines = describe_matches(*index.query(fp, exclude=name))
+        if add:
+            index.add(name, fp)
+    return lines
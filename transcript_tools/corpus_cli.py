@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .corpus import CorpusIndex, check_file, fingerprint_file
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="transcript-corpus",
+        description=(
+            "Keep a MinHash/LSH index of slimmed or grouped transcripts and "
+            "report near-duplicate episodes and shared passages."
+        ),
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    add = sub.add_parser("add", help="Add transcripts to the index.")
+    add.add_argument("index", type=Path, help="Path to the index file (created if missing).")
+    add.add_argument("inputs", type=Path, nargs="+", help="Slimmed or grouped JSON files.")
+
+    check = sub.add_parser(
+        "check",
+        help="Report near-duplicates of a transcript already in the index.",
+    )
+    check.add_argument("index", type=Path, help="Path to the index file (created if missing).")
+    check.add_argument("input", type=Path, help="Slimmed or grouped JSON file.")
+    check.add_argument(
+        "--add",
+        action="store_true",
+        help="Also add the transcript to the index after checking it.",
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "add":
+            with CorpusIndex(args.index) as index:
+                for path in args.inputs:
+                    if index.add(str(path.resolve()), fingerprint_file(path)):
+                        print(f"added {path}")
+                    else:
+                        print(f"skipped {path} (no words)")
+            return
+
+        lines = check_file(args.index, args.input, add=args.add)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    if not lines:
+        print("No near-duplicates found.")
+        return
+    for line in lines:
+        print(line)
+    # Non-zero so batch scripts can stop before triage.
+    raise SystemExit(2)
+
+
+if __name__ == "__main__":
+    main()
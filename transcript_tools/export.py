@@ -0,0 +1,308 @@
+from __future__ import annotations
+
+import sys
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterable, List, Mapping, Optional, Sequence, TextIO, Tuple
+
+from .markdown_export import group_speaker_and_text, render_markdown_paragraph
+from .ndjson import is_stdio
+
+
+@dataclass
+class CaptionOptions:
+    """
+    Layout and timing rules for caption sinks.
+
+    - max_line_length: characters per caption line
+    - max_lines: lines per caption cue
+    - max_cps: reading speed in characters per second; cues are kept on
+      screen at least long enough to be read at this speed
+    - min_duration: shortest time, in seconds, a cue stays on screen
+    """
+
+    max_line_length: int = 42
+    max_lines: int = 2
+    max_cps: float = 17.0
+    min_duration: float = 1.0
+
+    def __post_init__(self) -> None:
+        for name in ("max_line_length", "max_lines", "max_cps"):
+            if getattr(self, name) <= 0:
+                raise ValueError(f"{name} must be greater than 0; got {getattr(self, name)}")
+        if self.min_duration < 0:
+            raise ValueError(f"min_duration cannot be negative; got {self.min_duration}")
+
+
+class Sink(ABC):
+    """
+    An export target. The engine calls `write_group` once per group, in
+    order, and `close` once at the end; sinks write as they go. A path of
+    '-' writes to stdout.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._out: TextIO
+        if is_stdio(self.path):
+            sys.stdout.reconfigure(encoding="utf-8")
+            self._out = sys.stdout
+        else:
+            self._out = self.path.open("w", encoding="utf-8")
+
+    @abstractmethod
+    def write_group(self, speaker: str, text: str, group: Mapping[str, Any]) -> None:
+        ...
+
+    def close(self) -> None:
+        if self._out is sys.stdout:
+            self._out.flush()
+            return
+        self._out.close()
+
+
+class _ParagraphSink(Sink):
+    """
+    One paragraph per group, separated by blank lines, newline-terminated.
+    """
+
+    def __init__(self, path: Path) -> None:
+        super().__init__(path)
+        self._first = True
+
+    @abstractmethod
+    def render(self, speaker: str, text: str) -> Optional[str]:
+        ...
+
+    def write_group(self, speaker: str, text: str, group: Mapping[str, Any]) -> None:
+        paragraph = self.render(speaker, text)
+        if paragraph is None:
+            return
+        if not self._first:
+            self._out.write("\n\n")
+        self._out.write(paragraph)
+        self._first = False
+
+    def close(self) -> None:
+        self._out.write("\n")
+        super().close()
+
+
+class MarkdownSink(_ParagraphSink):
+    """Same output as `transcript-md`."""
+
+    def render(self, speaker: str, text: str) -> Optional[str]:
+        return render_markdown_paragraph(speaker, text)
+
+
+class TextSink(_ParagraphSink):
+    """Plain text paragraphs like 'Speaker Name: sentence one. ...'."""
+
+    def render(self, speaker: str, text: str) -> Optional[str]:
+        if not text:
+            return None
+        return f"{speaker}: {text}" if speaker else text
+
+
+# A cue under construction: (start, end, lines, speaker, opens_group).
+_Cue = Tuple[float, float, List[str], str, bool]
+
+
+def _timed_words(group: Mapping[str, Any]) -> Optional[List[Tuple[str, float, float]]]:
+    """
+    Word-level timings of a group, if every word carries them.
+    """
+    words = group.get("words")
+    if not isinstance(words, list) or not words:
+        return None
+    result = []
+    for w in words:
+        if not isinstance(w, Mapping):
+            return None
+        start, end = w.get("start"), w.get("end")
+        if not isinstance(start, (int, float)) or not isinstance(end, (int, float)):
+            return None
+        result.append((str(w.get("word", "")).strip(), float(start), float(end)))
+    return result
+
+
+def _group_span(group: Mapping[str, Any]) -> Optional[Tuple[float, float]]:
+    start, end = group.get("start"), group.get("end")
+    if isinstance(start, (int, float)) and isinstance(end, (int, float)) and end > start:
+        return float(start), float(end)
+    return None
+
+
+class _CaptionSink(Sink):
+    """
+    Splits each group's text into cues that respect the line-length and
+    line-count limits, and times them:
+
+    - from word timings ('words' with 'start'/'end') when every word has them,
+    - else by spreading the group's 'start'/'end' over its cues by length,
+    - else back to back from the previous cue at the reading speed.
+
+    Each cue is then stretched to its reading-speed minimum, without running
+    into the next cue. Only the last cue is ever held back, to learn where the
+    next one starts.
+
+    'groups' and 'untimed_groups' count the groups written and those that had
+    neither word timings nor a 'start'/'end' span.
+    """
+
+    def __init__(self, path: Path, options: Optional[CaptionOptions] = None) -> None:
+        super().__init__(path)
+        self.options = options or CaptionOptions()
+        self._pending: Optional[_Cue] = None
+        self._count = 0
+        self._clock = 0.0
+        self.groups = 0
+        self.untimed_groups = 0
+
+    def prefix_length(self, speaker: str) -> int:
+        """
+        Visible characters added in front of the first line of a group.
+        """
+        return 0
+
+    def _wrap(self, words: Sequence[str], reserve: int = 0) -> List[List[Tuple[int, int]]]:
+        """
+        Greedily pack words into cues; returns each cue as a list of
+        (first_word, end_word) index ranges, one per line. The very first line
+        is 'reserve' characters shorter, to leave room for a prefix.
+        """
+        limit = self.options.max_line_length
+        cues: List[List[Tuple[int, int]]] = []
+        lines: List[Tuple[int, int]] = []
+        line_start, line_len = 0, reserve
+
+        for i, word in enumerate(words):
+            if i > line_start and line_len + 1 + len(word) > limit:
+                lines.append((line_start, i))
+                if len(lines) == self.options.max_lines:
+                    cues.append(lines)
+                    lines = []
+                line_start, line_len = i, len(word)
+            else:
+                line_len += len(word) + (1 if i > line_start else 0)
+
+        if line_start < len(words):
+            lines.append((line_start, len(words)))
+        if lines:
+            cues.append(lines)
+        return cues
+
+    def write_group(self, speaker: str, text: str, group: Mapping[str, Any]) -> None:
+        timed = _timed_words(group)
+        words = [w for w, _, _ in timed] if timed else text.split()
+        if not words:
+            return
+
+        cues = self._wrap(words, self.prefix_length(speaker))
+        span = _group_span(group)
+        self.groups += 1
+        if not timed and not span:
+            self.untimed_groups += 1
+        total_chars = sum(len(w) + 1 for w in words)
+        span_pos = span[0] if span else 0.0
+
+        for cue_idx, lines in enumerate(cues):
+            first, last = lines[0][0], lines[-1][1]
+            line_texts = [" ".join(words[a:b]) for a, b in lines]
+            chars = sum(len(t) for t in line_texts)
+
+            if timed:
+                start, end = timed[first][1], timed[last - 1][2]
+            elif span:
+                share = sum(len(w) + 1 for w in words[first:last]) / total_chars
+                start = span_pos
+                end = span_pos = start + share * (span[1] - span[0])
+            else:
+                start = self._clock
+                end = start
+
+            end = max(end, start + chars / self.options.max_cps, start + self.options.min_duration)
+            self._push((start, end, line_texts, speaker, cue_idx == 0))
+
+    def _push(self, cue: _Cue) -> None:
+        if self._pending is not None:
+            start, end, lines, speaker, opens_group = self._pending
+            # Never overlap the next cue, but always leave something on screen.
+            end = max(min(end, cue[0]), start + 0.001)
+            self._emit((start, end, lines, speaker, opens_group))
+        self._pending = cue
+        self._clock = max(self._clock, cue[1])
+
+    @abstractmethod
+    def _emit(self, cue: _Cue) -> None:
+        ...
+
+    def close(self) -> None:
+        if self._pending is not None:
+            self._emit(self._pending)
+            self._pending = None
+        super().close()
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    millis = int(round(seconds * 1000))
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{separator}{millis:03d}"
+
+
+class SrtSink(_CaptionSink):
+    """SubRip captions; the speaker name leads the first cue of each group."""
+
+    def prefix_length(self, speaker: str) -> int:
+        return len(speaker) + 2 if speaker else 0
+
+    def _emit(self, cue: _Cue) -> None:
+        start, end, lines, speaker, opens_group = cue
+        self._count += 1
+        body = "\n".join(lines)
+        if speaker and opens_group:
+            body = f"{speaker}: {body}"
+        self._out.write(
+            f"{self._count}\n"
+            f"{_timestamp(start, ',')} --> {_timestamp(end, ',')}\n"
+            f"{body}\n\n"
+        )
+
+
+def _escape_vtt(text: str) -> str:
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+
+class VttSink(_CaptionSink):
+    """WebVTT captions; the speaker is carried in a <v> voice span."""
+
+    def __init__(self, path: Path, options: Optional[CaptionOptions] = None) -> None:
+        super().__init__(path, options)
+        self._out.write("WEBVTT\n\n")
+
+    def _emit(self, cue: _Cue) -> None:
+        start, end, lines, speaker, _ = cue
+        body = _escape_vtt("\n".join(lines))
+        if speaker:
+            body = f"<v {_escape_vtt(speaker)}>{body}"
+        self._out.write(f"{_timestamp(start, '.')} --> {_timestamp(end, '.')}\n{body}\n\n")
+
+
+def export_groups(groups: Iterable[Any], sinks: Sequence[Sink]) -> None:
+    """
+    Feed every group to every sink in a single pass, then close the sinks.
+    Non-mapping entries are skipped, as in `transcript-md`.
+    """
+    try:
+        for group in groups:
+            if not isinstance(group, Mapping):
+                continue
+            speaker, text = group_speaker_and_text(group)
+            for sink in sinks:
+                sink.write_group(speaker, text, group)
+    finally:
+        for sink in sinks:
+            sink.close()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .export import (
+    CaptionOptions,
+    MarkdownSink,
+    Sink,
+    SrtSink,
+    TextSink,
+    VttSink,
+    export_groups,
+)
+from .ndjson import iter_records
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="transcript-export",
+        description=(
+            "Export a triaged/grouped transcript JSON to any combination of "
+            "markdown, SRT, WebVTT and plain text in a single pass."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help=(
+            "Path to the triaged/grouped JSON file, or '-' to stream NDJSON "
+            "groups from stdin."
+        ),
+    )
+    parser.add_argument("--md", type=Path, help="Write a markdown transcript here.")
+    parser.add_argument("--srt", type=Path, help="Write SubRip captions here.")
+    parser.add_argument("--vtt", type=Path, help="Write WebVTT captions here.")
+    parser.add_argument("--txt", type=Path, help="Write a plain text transcript here.")
+    parser.add_argument(
+        "--max-line-length",
+        type=int,
+        default=CaptionOptions.max_line_length,
+        help="Caption line length in characters (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--max-lines",
+        type=int,
+        default=CaptionOptions.max_lines,
+        help="Caption lines per cue (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--max-cps",
+        type=float,
+        default=CaptionOptions.max_cps,
+        help=(
+            "Caption reading speed in characters per second; cues stay on "
+            "screen long enough to be read at this speed (default: %(default)s)."
+        ),
+    )
+
+    args = parser.parse_args(argv)
+
+    if not (args.md or args.srt or args.vtt or args.txt):
+        parser.error("at least one of --md, --srt, --vtt, --txt is required")
+    for option, value in (
+        ("--max-line-length", args.max_line_length),
+        ("--max-lines", args.max_lines),
+        ("--max-cps", args.max_cps),
+    ):
+        if value <= 0:
+            parser.error(f"{option} must be greater than 0")
+
+    options = CaptionOptions(
+        max_line_length=args.max_line_length,
+        max_lines=args.max_lines,
+        max_cps=args.max_cps,
+    )
+
+    sinks: List[Sink] = []
+    try:
+        # Read (or start streaming) the input before creating any outputs.
+        groups = iter_records(args.input)
+
+        if args.md:
+            sinks.append(MarkdownSink(args.md))
+        if args.txt:
+            sinks.append(TextSink(args.txt))
+        if args.srt:
+            sinks.append(SrtSink(args.srt, options))
+        if args.vtt:
+            sinks.append(VttSink(args.vtt, options))
+
+        export_groups(groups, sinks)
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    # Every caption sink sees the same groups, so one report covers them all.
+    captions = [sink for sink in sinks if isinstance(sink, (SrtSink, VttSink))]
+    if captions and captions[0].untimed_groups:
+        print(
+            f"Warning: {captions[0].untimed_groups} of {captions[0].groups} groups "
+            "have no timings ('words' or 'start'/'end'), so their captions are "
+            "timed back to back at the reading speed. Use transcript-align to get "
+            "a timestamped grouped JSON.",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
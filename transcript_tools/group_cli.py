@@ -19,21 +19,46 @@ def main(argv: Optional[list[str]] = None) -> None:
     parser.add_argument(
         "input",
         type=Path,
-        help="Path to the *slimmed* input JSON file.",
+        help="Path to the *slimmed* input JSON file, or '-' for NDJSON on stdin.",
     )
     parser.add_argument(
         "output",
         type=Path,
-        help="Path where the grouped JSON will be written.",
+        help="Path where the grouped JSON will be written, or '-' for NDJSON on stdout.",
+    )
+    parser.add_argument(
+        "--collapse-repeats",
+        action="store_true",
+        help=(
+            "Collapse whisper repetition loops and drop near-duplicate adjacent "
+            "segments before grouping."
+        ),
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help=(
+            "Group and encode in this many worker processes; 0 means one per "
+            "CPU. The output is identical either way (default: 1)."
+        ),
     )
 
     args = parser.parse_args(argv)
+    if args.workers < 0:
+        parser.error("--workers cannot be negative")
 
     try:
-        group_consecutive_segments_file(
+        report_lines = group_consecutive_segments_file(
             input_path=args.input,
             output_path=args.output,
+            collapse_repeats=args.collapse_repeats,
+            workers=args.workers,
         )
+        for line in report_lines:
+            # stderr, so stdout stays clean when it carries NDJSON.
+            print(f"collapsed {line}", file=sys.stderr)
     except Exception as exc:  # noqa: BLE001
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)
@@ -0,0 +1,392 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import re
+import struct
+from array import array
+from bisect import bisect_right
+from collections.abc import MutableSequence
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union, overload
+
+from .ndjson import temp_file_beside
+from .triage import Group, group_from_item, group_search_text, group_to_item
+
+
+# Sidecar layout: magic, then (file size, mtime_ns, record count), then
+# 'count' triples of (start, end, flags), all little-endian uint64. 'start'
+# and 'end' are the record's byte offsets.
+_INDEX_MAGIC = b"TTGIDX2\0"
+_INDEX_HEADER = struct.Struct("<8sQQQ")
+_FIELDS = 3
+
+# Record flag: the group's 'segments' list has at least one item.
+_HAS_SEGMENTS = 1
+
+# Structural JSON tokens. Whole strings are matched in one go so brackets and
+# braces inside segment text are never mistaken for structure.
+_JSON_TOKEN_RE = re.compile(rb'"(?:[^"\\]|\\.)*"|[\[\]{}]', re.DOTALL)
+_WHITESPACE = b" \t\r\n"
+
+# Between two words of a jump query: whitespace, an escaped line break, or
+# the end of one segment string and the start of the next.
+_QUERY_GAP = rb'(?:\s|\\[nrt]|"\s*,\s*")+'
+
+# Clean groups further than this from the last accessed index are dropped
+# back to their byte offsets.
+_WINDOW_RADIUS = 8
+
+
+def index_path_for(path: Path) -> Path:
+    return path.with_name(path.name + ".idx")
+
+
+def build_group_index(buf: Any) -> array:
+    """
+    Scan a grouped JSON document and return (start, end, flags) for every
+    object in its top-level 'segments' list, flattened into one array.
+    """
+    offsets = array("Q")
+    depth = 0
+    in_groups = False
+    last_key: Optional[bytes] = None
+    group_start = -1
+    group_flags = 0
+    list_start = -1
+
+    for m in _JSON_TOKEN_RE.finditer(buf):
+        token = m.group()
+        first = token[:1]
+
+        if first == b'"':
+            if depth == 1 or (in_groups and depth == 3):
+                # Keys are the strings followed by a ':'.
+                pos = m.end()
+                while pos < len(buf) and buf[pos] in _WHITESPACE:
+                    pos += 1
+                last_key = token if buf[pos : pos + 1] == b":" else None
+            continue
+
+        if first in (b"{", b"["):
+            if depth == 1 and first == b"[" and last_key == b'"segments"':
+                in_groups = True
+            elif in_groups and depth == 2 and first == b"{":
+                group_start = m.start()
+                group_flags = 0
+            elif in_groups and depth == 3 and first == b"[" and last_key == b'"segments"':
+                list_start = m.end()
+            depth += 1
+            continue
+
+        depth -= 1
+        if in_groups and depth == 3 and first == b"]" and list_start >= 0:
+            if buf[list_start : m.start()].strip(_WHITESPACE):
+                group_flags |= _HAS_SEGMENTS
+            list_start = -1
+        elif in_groups and depth == 2 and first == b"}":
+            offsets.extend((group_start, m.end(), group_flags))
+        elif in_groups and depth == 1:
+            # End of the 'segments' list; nothing else is of interest.
+            return offsets
+
+    raise ValueError("Expected top-level key 'segments' containing a list.")
+
+
+def load_group_index(path: Path, buf: Any) -> array:
+    """
+    Return the record offsets for 'path', reusing the '.idx' sidecar when it
+    matches the file's size and mtime, otherwise rebuilding and caching it.
+    """
+    stat = path.stat()
+    sidecar = index_path_for(path)
+
+    try:
+        with sidecar.open("rb") as f:
+            magic, size, mtime_ns, count = _INDEX_HEADER.unpack(f.read(_INDEX_HEADER.size))
+            if magic == _INDEX_MAGIC and size == stat.st_size and mtime_ns == stat.st_mtime_ns:
+                offsets = array("Q")
+                offsets.frombytes(f.read(count * _FIELDS * offsets.itemsize))
+                if len(offsets) == count * _FIELDS:
+                    return offsets
+    except (OSError, struct.error):
+        pass
+
+    offsets = build_group_index(buf)
+    try:
+        with sidecar.open("wb") as f:
+            f.write(
+                _INDEX_HEADER.pack(
+                    _INDEX_MAGIC, stat.st_size, stat.st_mtime_ns, len(offsets) // _FIELDS
+                )
+            )
+            offsets.tofile(f)
+    except OSError:
+        # A read-only directory just means no cache next time.
+        pass
+    return offsets
+
+
+# U+0130 is the one character whose lowercase is longer than itself.
+_DOTTED_I = ("i\u0307", "\u0130")
+
+
+def _char_pattern(ch: str) -> bytes:
+    """
+    Any case of 'ch' as it can appear inside a JSON string, raw or escaped.
+    ASCII case is left to re.IGNORECASE.
+    """
+    if ch.isascii():
+        return re.escape(json.dumps(ch)[1:-1].encode("ascii"))
+    alternatives = set()
+    variants = {ch, ch.lower(), ch.upper()}
+    if ch == _DOTTED_I[0]:
+        variants.add(_DOTTED_I[1])
+    for variant in variants:
+        alternatives.add(json.dumps(variant, ensure_ascii=False)[1:-1].encode("utf-8"))
+        alternatives.add(json.dumps(variant)[1:-1].encode("ascii"))
+    escaped = sorted((re.escape(a) for a in alternatives), key=len, reverse=True)
+    return escaped[0] if len(escaped) == 1 else b"(?:" + b"|".join(escaped) + b")"
+
+
+def _query_pattern(needle: str) -> "re.Pattern[bytes]":
+    words = []
+    for word in needle.split(" "):
+        pieces = word.replace(_DOTTED_I[0], "\0").split("\0")
+        words.append(
+            _char_pattern(_DOTTED_I[0]).join(
+                b"".join(_char_pattern(ch) for ch in piece) for piece in pieces
+            )
+        )
+    return re.compile(_QUERY_GAP.join(words), re.IGNORECASE)
+
+
+# An entry is either the number of an untouched record in the file or a
+# materialized Group.
+_Entry = Union[int, Group]
+
+
+class LazyGroups(MutableSequence[Group]):
+    """
+    A list of Groups backed by a memory-mapped grouped JSON file.
+
+    Only the groups that are actually accessed are parsed, and groups that
+    were parsed but never modified are dropped again once the cursor moves
+    away from them. `dump` streams untouched records straight from the
+    original bytes and re-encodes only the modified groups, so resuming deep
+    into a very large file costs about the same as resuming near the start.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = Path(path)
+        if self._path.stat().st_size == 0:
+            raise ValueError(f"{self._path} is empty.")
+        self._file = self._path.open("rb")
+        self._buf = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._offsets = load_group_index(self._path, self._buf)
+        self._entries: List[_Entry] = list(range(len(self._offsets) // _FIELDS))
+        # id(group) -> (record number, original speaker, original segments)
+        self._snapshots: Dict[int, Tuple[int, str, Tuple[str, ...]]] = {}
+        # Positions of materialized groups that are still clean.
+        self._clean: set[int] = set()
+        # Record start offsets, for mapping search hits back to records.
+        self._starts: Optional[array] = None
+
+    def close(self) -> None:
+        self._buf.close()
+        self._file.close()
+
+    def _record_bytes(self, record: int) -> bytes:
+        start = self._offsets[_FIELDS * record]
+        return self._buf[start : self._offsets[_FIELDS * record + 1]]
+
+    def _has_segments(self, record: int) -> bool:
+        return bool(self._offsets[_FIELDS * record + 2] & _HAS_SEGMENTS)
+
+    def _parse_record(self, record: int) -> Group:
+        return group_from_item(json.loads(self._record_bytes(record).decode("utf-8")))
+
+    def _materialize(self, index: int) -> Group:
+        entry = self._entries[index]
+        if isinstance(entry, Group):
+            return entry
+
+        group = self._parse_record(entry)
+        self._entries[index] = group
+        self._snapshots[id(group)] = (entry, group.speaker, tuple(group.segments))
+        self._clean.add(index)
+        self._evict_far_from(index)
+        return group
+
+    def _is_clean(self, group: Group) -> bool:
+        snapshot = self._snapshots.get(id(group))
+        return snapshot is not None and snapshot[1:] == (group.speaker, tuple(group.segments))
+
+    def _evict_far_from(self, index: int) -> None:
+        for pos in [p for p in self._clean if abs(p - index) > _WINDOW_RADIUS]:
+            self._clean.discard(pos)
+            group = self._entries[pos]
+            assert isinstance(group, Group)
+            if self._is_clean(group):
+                self._entries[pos] = self._snapshots.pop(id(group))[0]
+            # Modified groups stay materialized until they are written out.
+
+    def _normalize(self, index: int) -> int:
+        if index < 0:
+            index += len(self._entries)
+        if not 0 <= index < len(self._entries):
+            raise IndexError("group index out of range")
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @overload
+    def __getitem__(self, index: int) -> Group: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Group]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Group, List[Group]]:
+        if isinstance(index, slice):
+            return [self._materialize(i) for i in range(*index.indices(len(self)))]
+        return self._materialize(self._normalize(index))
+
+    def __setitem__(self, index: Union[int, slice], value: Any) -> None:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                raise ValueError("LazyGroups only supports contiguous slices.")
+            stop = max(start, stop)
+            new_groups: List[Group] = list(value)
+            self._replace(start, stop, new_groups)
+            return
+        index = self._normalize(index)
+        self._replace(index, index + 1, [value])
+
+    def __delitem__(self, index: Union[int, slice]) -> None:
+        if isinstance(index, slice):
+            self[index] = []
+            return
+        index = self._normalize(index)
+        self._replace(index, index + 1, [])
+
+    def insert(self, index: int, value: Group) -> None:
+        index = max(0, min(len(self), index + len(self) if index < 0 else index))
+        self._replace(index, index, [value])
+
+    def _replace(self, start: int, stop: int, new_groups: List[Group]) -> None:
+        for entry in self._entries[start:stop]:
+            if isinstance(entry, Group):
+                self._snapshots.pop(id(entry), None)
+        shift = len(new_groups) - (stop - start)
+        self._clean = {
+            pos if pos < start else pos + shift
+            for pos in self._clean
+            if not start <= pos < stop
+        }
+        self._entries[start:stop] = new_groups
+
+    def find_text(self, needle: str, after: int = -1) -> Optional[int]:
+        """
+        Index of the first group after 'after' (wrapping around) whose
+        `group_search_text` contains 'needle', which must be lowercased with
+        single spaces.
+
+        Untouched records are found with a regular expression over the
+        mapped file, and only records it hits are parsed to confirm the
+        match; groups in memory are checked directly. Nothing is cached, so
+        a search costs about one pass over the file's bytes.
+        """
+        pattern = _query_pattern(needle)
+        total = len(self._entries)
+        for lo, hi in ((after + 1, total), (0, min(after + 1, total))):
+            found = self._find_text_in(pattern, needle, lo, hi)
+            if found is not None:
+                return found
+        return None
+
+    def _find_text_in(
+        self,
+        pattern: "re.Pattern[bytes]",
+        needle: str,
+        lo: int,
+        hi: int,
+    ) -> Optional[int]:
+        # Untouched records appear in file order, so one forward search serves
+        # all of them: 'hit' is the next record with a byte match.
+        hit = -1
+        for index in range(lo, hi):
+            entry = self._entries[index]
+            if isinstance(entry, Group):
+                if needle in group_search_text(entry):
+                    return index
+                continue
+            if hit < entry:
+                hit = self._next_hit(pattern, entry)
+            if hit == entry:
+                if needle in group_search_text(self._parse_record(entry)):
+                    return index
+                hit = -1
+        return None
+
+    def _next_hit(self, pattern: "re.Pattern[bytes]", record: int) -> int:
+        """
+        The first record at or after 'record' whose bytes match 'pattern', or
+        the record count if there is none.
+        """
+        count = len(self._offsets) // _FIELDS
+        if self._starts is None:
+            self._starts = self._offsets[0::_FIELDS]
+        while record < count:
+            m = pattern.search(self._buf, self._offsets[_FIELDS * record])
+            if m is None:
+                return count
+            record = bisect_right(self._starts, m.start()) - 1
+            if m.end() <= self._offsets[_FIELDS * record + 1]:
+                return record
+            # Matched outside the record's object; try from the next one.
+            record += 1
+        return count
+
+    def _iter_records(self) -> Iterable[bytes]:
+        # Same rule as dump_groups: empty groups carry no information.
+        for entry in self._entries:
+            if isinstance(entry, int):
+                if self._has_segments(entry):
+                    yield self._record_bytes(entry)
+                continue
+            if not entry.segments:
+                continue
+            if self._is_clean(entry):
+                yield self._record_bytes(self._snapshots[id(entry)][0])
+                continue
+            encoded = json.dumps(group_to_item(entry), ensure_ascii=False, indent=2)
+            yield encoded.replace("\n", "\n    ").encode("utf-8")
+
+    def dump(self, path: Path) -> None:
+        """
+        Write the groups to 'path' in the same layout as `dump_groups`, then
+        close the underlying file. 'path' may be the file being read.
+
+        Like `dump_groups`, groups without segments are left out. Unmodified
+        groups are copied byte for byte, so unlike `dump_groups` they keep any
+        fields besides 'speaker' and 'segments'.
+        """
+        path = Path(path)
+        fd, tmp_name = temp_file_beside(path)
+        try:
+            with os.fdopen(fd, "wb") as out:
+                out.write(b'{\n  "segments": [')
+                first = True
+                for record in self._iter_records():
+                    out.write(b"\n    " if first else b",\n    ")
+                    out.write(record)
+                    first = False
+                out.write(b"]\n}" if first else b"\n  ]\n}")
+            self.close()
+            os.replace(tmp_name, path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
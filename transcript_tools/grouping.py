@@ -1,8 +1,13 @@
 from __future__ import annotations
 
-import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from .ndjson import RecordWriter, encode_document_item, iter_records
+from .repetition import collapse_repetitions, describe_report, detect_repetitions
 
 
 def group_consecutive_segments(
@@ -27,8 +32,16 @@ def group_consecutive_segments(
 
     Grouping happens only for *consecutive* segments with the same speaker.
     """
-    grouped: list[Dict[str, Any]] = []
+    return {"segments": list(iter_grouped_segments(segments))}
+
 
+def iter_grouped_segments(
+    segments: Iterable[Mapping[str, Any]],
+) -> Iterator[Dict[str, Any]]:
+    """
+    Lazily yield the groups described in `group_consecutive_segments`, each
+    one as soon as the speaker changes.
+    """
     current_speaker: Any = None
     current_utts: list[str] = []
 
@@ -39,12 +52,10 @@ def group_consecutive_segments(
         if speaker != current_speaker:
             # Flush previous group
             if current_speaker is not None:
-                grouped.append(
-                    {
-                        "speaker": current_speaker,
-                        "segments": current_utts,
-                    }
-                )
+                yield {
+                    "speaker": current_speaker,
+                    "segments": current_utts,
+                }
             current_speaker = speaker
             current_utts = [text]
         else:
@@ -52,38 +63,156 @@ def group_consecutive_segments(
 
     # Flush last group
     if current_speaker is not None:
-        grouped.append(
-            {
-                "speaker": current_speaker,
-                "segments": current_utts,
-            }
-        )
+        yield {
+            "speaker": current_speaker,
+            "segments": current_utts,
+        }
+
+
+# Result of grouping one chunk: (first group, middle groups, last group,
+# group count). The middle groups may already be JSON-encoded.
+_ChunkResult = Tuple[Optional[Dict[str, Any]], List[Any], Optional[Dict[str, Any]], int]
+
+
+def _group_chunk(segments: Sequence[Mapping[str, Any]], encode: bool) -> _ChunkResult:
+    groups = group_consecutive_segments(segments)["segments"]
+    if not groups:
+        return None, [], None, 0
+
+    middle: List[Any] = groups[1:-1]
+    if encode:
+        middle = [encode_document_item(g) for g in middle]
+    tail = groups[-1] if len(groups) > 1 else None
+    return groups[0], middle, tail, len(groups)
+
+
+def _merge_chunk_results(
+    chunks: Sequence[Sequence[Mapping[str, Any]]],
+    results: Iterable[_ChunkResult],
+) -> Iterator[Any]:
+    """
+    Yield the groups of all chunks in order, joining the last group of one
+    chunk with the first group of the next when the speaker carries on across
+    the split.
+
+    Only the speakers of the segments either side of a split decide whether
+    to join, which keeps the sequential function's handling of segments with
+    no speaker (they end a group and are dropped).
+    """
+    pending: Optional[Dict[str, Any]] = None
+    prev_last_speaker: Any = None
+
+    for chunk, (head, middle, tail, count) in zip(chunks, results):
+        first_speaker = chunk[0].get("speaker")
+
+        if count:
+            assert head is not None
+            if pending is not None and first_speaker is not None and first_speaker == prev_last_speaker:
+                pending["segments"].extend(head["segments"])
+            else:
+                if pending is not None:
+                    yield pending
+                pending = head
 
-    return {"segments": grouped}
+            if count > 1:
+                yield pending
+                yield from middle
+                pending = tail
+
+        prev_last_speaker = chunk[-1].get("speaker")
+
+    if pending is not None:
+        yield pending
+
+
+def _split_chunks(
+    segments: Sequence[Mapping[str, Any]],
+    workers: int,
+    chunk_size: Optional[int],
+) -> List[Sequence[Mapping[str, Any]]]:
+    if chunk_size is None:
+        # A few chunks per worker evens out uneven chunks.
+        chunk_size = max(1, -(-len(segments) // (workers * 4)))
+    return [segments[i : i + chunk_size] for i in range(0, len(segments), chunk_size)]
+
+
+def _group_in_parallel(
+    segments: Sequence[Mapping[str, Any]],
+    workers: Optional[int],
+    chunk_size: Optional[int],
+    encode: bool,
+) -> Iterator[Any]:
+    if workers is not None and workers < 0:
+        raise ValueError(f"workers cannot be negative; got {workers}")
+    workers = workers or os.cpu_count() or 1
+    chunks = _split_chunks(segments, workers, chunk_size)
+
+    if workers <= 1 or len(chunks) <= 1:
+        results: Iterable[_ChunkResult] = map(_group_chunk, chunks, repeat(encode))
+        yield from _merge_chunk_results(chunks, results)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_group_chunk, chunks, repeat(encode))
+        yield from _merge_chunk_results(chunks, results)
+
+
+def group_consecutive_segments_parallel(
+    segments: Sequence[Mapping[str, Any]],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Same result as `group_consecutive_segments`, computed by grouping chunks
+    of 'segments' in up to 'workers' processes (default: one per CPU) and
+    joining groups that continue across chunk boundaries.
+    """
+    return {"segments": list(_group_in_parallel(segments, workers, chunk_size, encode=False))}
 
 
 def group_consecutive_segments_file(
     input_path: str | Path,
     output_path: str | Path,
-) -> None:
+    collapse_repeats: bool = False,
+    workers: int = 1,
+) -> List[str]:
     """
     Read a 'slimmed' JSON (with top-level 'segments' list of {text, speaker}),
     group consecutive segments by speaker, and write the grouped JSON.
+
+    Either path may be '-' for NDJSON on stdin/stdout, one record per line;
+    groups are then written as soon as the speaker changes.
+
+    If 'collapse_repeats' is set, whisper repetition loops and near-duplicate
+    adjacent segments are collapsed before grouping (see `repetition`), and
+    a description of what was collapsed is returned.
+
+    With 'workers' other than 1, grouping and JSON encoding are spread over
+    that many processes (0 means one per CPU); the output is identical.
+    Both options need the whole transcript in memory.
     """
-    input_path = Path(input_path)
-    output_path = Path(output_path)
+    segments: Iterable[Mapping[str, Any]] = iter_records(input_path)
 
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
+    report_lines: List[str] = []
+    if collapse_repeats:
+        segments = list(segments)
+        report = detect_repetitions(segments)
+        report_lines = describe_report(report)
+        segments = collapse_repetitions(segments, report)
 
-    segments = data.get("segments")
-    if not isinstance(segments, list):
-        raise ValueError(
-            f"Expected top-level key 'segments' containing a list; "
-            f"got {type(segments)!r}"
-        )
+    with RecordWriter(output_path) as writer:
+        if workers == 1:
+            writer.write_all(iter_grouped_segments(segments))
+            return report_lines
 
-    grouped = group_consecutive_segments(segments)
+        # Workers can pre-encode groups for a JSON document, not for NDJSON.
+        grouped = _group_in_parallel(
+            list(segments), workers or None, None, encode=not writer.is_ndjson
+        )
+        for item in grouped:
+            if isinstance(item, str):
+                writer.write_encoded(item)
+            else:
+                writer.write(item)
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(grouped, f, ensure_ascii=False, indent=2)
+    return report_lines
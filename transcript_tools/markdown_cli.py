@@ -5,7 +5,8 @@ import sys
 from pathlib import Path
 from typing import Optional
 
-from .markdown_export import export_markdown_from_json
+from .export import MarkdownSink, export_groups
+from .ndjson import iter_records
 
 
 def main(argv: Optional[list[str]] = None) -> None:
@@ -19,18 +20,22 @@ def main(argv: Optional[list[str]] = None) -> None:
     parser.add_argument(
         "input",
         type=Path,
-        help="Path to the triaged/grouped JSON file.",
+        help=(
+            "Path to the triaged/grouped JSON file, or '-' to stream NDJSON "
+            "groups from stdin."
+        ),
     )
     parser.add_argument(
         "output",
         type=Path,
-        help="Path where the markdown file should be written.",
+        help="Path where the markdown file should be written, or '-' for stdout.",
     )
 
     args = parser.parse_args(argv)
 
     try:
-        export_markdown_from_json(args.input, args.output)
+        groups = iter_records(args.input)
+        export_groups(groups, [MarkdownSink(args.output)])
     except Exception as exc:  # noqa: BLE001
         print(f"Error: {exc}", file=sys.stderr)
         raise SystemExit(1)
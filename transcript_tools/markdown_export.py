@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import json
 from pathlib import Path
-from typing import Any, Iterable, Mapping, List
+from typing import Any, Iterable, Mapping, List, Optional, Tuple
 
 
-def _load_groups_from_json(path: Path) -> List[Mapping[str, Any]]:
+def load_groups_from_json(path: Path) -> List[Mapping[str, Any]]:
     with path.open("r", encoding="utf-8") as f:
         data = json.load(f)
 
@@ -32,6 +32,40 @@ def _concat_group_segments(raw_segments: Iterable[str]) -> str:
     return " ".join(cleaned)
 
 
+def group_speaker_and_text(group: Mapping[str, Any]) -> Tuple[str, str]:
+    """
+    Return the stripped speaker name and the concatenated text of a group.
+    """
+    speaker_raw = group.get("speaker", "")
+    speaker = str(speaker_raw).strip()
+
+    raw_segments = group.get("segments") or []
+    if not isinstance(raw_segments, list):
+        raise ValueError("Each group 'segments' field must be a list.")
+
+    return speaker, _concat_group_segments(raw_segments)
+
+
+def render_markdown_paragraph(speaker: str, text: str) -> Optional[str]:
+    """
+    Render one group as a markdown paragraph, or None if there is nothing to
+    say for it.
+    """
+    # If there's nothing to say for this group, skip it.
+    if not text and not speaker:
+        return None
+
+    if speaker:
+        if text:
+            # NOTE: colon after speaker, per your request
+            return f"**{speaker}**: {text}"
+        # Speaker but no text (weird but possible)
+        return f"**{speaker}**:"
+
+    # No speaker; just output the text.
+    return text
+
+
 def export_markdown_from_json(input_path: Path, output_path: Path) -> None:
     """
     Read a triaged/grouped JSON file and produce a markdown transcript where
@@ -41,7 +75,7 @@ def export_markdown_from_json(input_path: Path, output_path: Path) -> None:
 
     Groups appear in the same order as in the JSON.
     """
-    groups = _load_groups_from_json(input_path)
+    groups = load_groups_from_json(input_path)
 
     lines: List[str] = []
 
@@ -49,30 +83,11 @@ def export_markdown_from_json(input_path: Path, output_path: Path) -> None:
         if not isinstance(group, Mapping):
             continue
 
-        speaker_raw = group.get("speaker", "")
-        speaker = str(speaker_raw).strip()
-
-        raw_segments = group.get("segments") or []
-        if not isinstance(raw_segments, list):
-            raise ValueError("Each group 'segments' field must be a list.")
-
-        text = _concat_group_segments(raw_segments)
-
-        # If there's nothing to say for this group, skip it.
-        if not text and not speaker:
+        paragraph = render_markdown_paragraph(*group_speaker_and_text(group))
+        if paragraph is None:
             continue
 
-        if speaker:
-            if text:
-                # NOTE: colon after speaker, per your request
-                lines.append(f"**{speaker}**: {text}")
-            else:
-                # Speaker but no text (weird but possible)
-                lines.append(f"**{speaker}**:")
-        else:
-            # No speaker; just output the text.
-            lines.append(text)
-
+        lines.append(paragraph)
         # Blank line between groups for readability.
         lines.append("")
 
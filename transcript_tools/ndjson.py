@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any, Iterable, Iterator, TextIO, Tuple
+
+
+# Passing this as an input or output path means stdin/stdout, with one JSON
+# record per line (NDJSON) instead of a {"segments": [...]} document.
+STDIO = "-"
+
+
+def is_stdio(path: str | Path) -> bool:
+    return str(path) == STDIO
+
+
+def read_ndjson(stream: TextIO) -> Iterator[Any]:
+    """
+    Yield one decoded record per non-blank line, as lines arrive.
+    """
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            raise ValueError(f"Invalid JSON on input line {line_no}: {exc}") from exc
+
+
+def load_document_segments(path: str | Path) -> list[Any]:
+    with Path(path).open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    segments = data.get("segments")
+    if not isinstance(segments, list):
+        raise ValueError(
+            f"Expected top-level key 'segments' containing a list; "
+            f"got {type(segments)!r}"
+        )
+    return segments
+
+
+def iter_records(path: str | Path) -> Iterator[Any]:
+    """
+    Records from 'path': streamed NDJSON lines for '-', otherwise the items of
+    the file's top-level 'segments' list. A file is read (and validated)
+    before this returns, so errors surface before any output is opened.
+    """
+    if is_stdio(path):
+        sys.stdin.reconfigure(encoding="utf-8")
+        return read_ndjson(sys.stdin)
+    return iter(load_document_segments(path))
+
+
+def _umask() -> int:
+    mask = os.umask(0)
+    os.umask(mask)
+    return mask
+
+
+def temp_file_beside(path: Path) -> Tuple[int, str]:
+    """
+    Create a temporary file in the directory of 'path', for writing and then
+    `os.replace`-ing over it. It gets the permissions 'path' has (or would get
+    from a plain `open`), since mkstemp creates files private.
+    """
+    fd, tmp_name = tempfile.mkstemp(prefix=path.name, suffix=".tmp", dir=path.parent)
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        mode = 0o666 & ~_umask()
+    os.chmod(tmp_name, mode)
+    return fd, tmp_name
+
+
+def encode_document_item(record: Any) -> str:
+    """
+    Encode one item exactly as `json.dump(..., indent=2)` lays it out inside
+    the top-level 'segments' list.
+    """
+    return json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+
+
+class RecordWriter:
+    """
+    Writes records one at a time: NDJSON lines to stdout for '-', otherwise
+    a {"segments": [...]} document laid out exactly like
+    `json.dump(..., indent=2)`.
+
+    A document is written to a temporary file next to 'path' and only moved
+    into place by `close`; `discard` (or leaving a `with` block with an
+    exception) removes it instead, so a failed run never leaves a truncated
+    but valid document behind.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self._ndjson = is_stdio(path)
+        self._out: TextIO
+        self._path = Path(path)
+        self._tmp_name = ""
+        if self._ndjson:
+            sys.stdout.reconfigure(encoding="utf-8")
+            self._out = sys.stdout
+        else:
+            fd, self._tmp_name = temp_file_beside(self._path)
+            self._out = os.fdopen(fd, "w", encoding="utf-8")
+            self._out.write('{\n  "segments": [')
+        self._first = True
+
+    @property
+    def is_ndjson(self) -> bool:
+        return self._ndjson
+
+    def write(self, record: Any) -> None:
+        if self._ndjson:
+            self._out.write(json.dumps(record, ensure_ascii=False))
+            self._out.write("\n")
+            return
+        self.write_encoded(encode_document_item(record))
+
+    def write_encoded(self, encoded: str) -> None:
+        """
+        Write an item already encoded with `encode_document_item`.
+        """
+        if self._ndjson:
+            raise ValueError("Pre-encoded items can only be written to a JSON document.")
+        self._out.write("\n    " if self._first else ",\n    ")
+        self._out.write(encoded)
+        self._first = False
+
+    def write_all(self, records: Iterable[Any]) -> None:
+        for record in records:
+            self.write(record)
+
+    def close(self) -> None:
+        if self._ndjson:
+            self._out.flush()
+            return
+        try:
+            self._out.write("]\n}" if self._first else "\n  ]\n}")
+            self._out.close()
+            os.replace(self._tmp_name, self._path)
+        except BaseException:
+            self.discard()
+            raise
+
+    def discard(self) -> None:
+        """
+        Abandon the output: a document isn't written at all. NDJSON records
+        already sent to stdout can't be taken back.
+        """
+        if self._ndjson:
+            return
+        self._out.close()
+        try:
+            os.unlink(self._tmp_name)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "RecordWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if exc_info[0] is not None:
+            self.discard()
+        else:
+            self.close()
+
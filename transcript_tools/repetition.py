@@ -0,0 +1,370 @@
+from __future__ import annotations
+
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Sequence, Tuple
+
+
+# Polynomial rolling hash over token ids, modulo the Mersenne prime 2**61 - 1.
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+_TOKEN_RE = re.compile(r"\w+(?:['’]\w+)*")
+
+
+@dataclass
+class RepeatedRun:
+    """
+    A phrase repeated back-to-back inside a single segment, e.g. a whisper
+    hallucination loop like "thank you thank you thank you ...".
+
+    'start'/'end' are character offsets into the segment text covering every
+    copy of the phrase; 'keep_end' is where the first copy ends.
+    """
+
+    segment: int
+    start: int
+    end: int
+    keep_end: int
+    phrase: str
+    repeats: int
+
+
+@dataclass
+class DuplicateSegment:
+    """
+    A segment that (nearly) repeats the segment right before it. 'duplicate_of'
+    always points at the first segment of a chain of duplicates.
+    """
+
+    segment: int
+    duplicate_of: int
+    similarity: float
+
+
+@dataclass
+class RepetitionReport:
+    runs: List[RepeatedRun] = field(default_factory=list)
+    duplicates: List[DuplicateSegment] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.runs or self.duplicates)
+
+
+class _Tokens:
+    """
+    Tokenized segment text: normalized token ids, their character spans, and
+    prefix hashes so that the hash of any token window is O(1).
+    """
+
+    def __init__(self, text: str, vocab: Dict[str, int]) -> None:
+        self.ids: List[int] = []
+        self.spans: List[Tuple[int, int]] = []
+        for m in _TOKEN_RE.finditer(text):
+            word = m.group().lower()
+            token_id = vocab.get(word)
+            if token_id is None:
+                token_id = vocab[word] = len(vocab) + 1
+            self.ids.append(token_id)
+            self.spans.append(m.span())
+
+        self._prefix = [0] * (len(self.ids) + 1)
+        self._powers = [1] * (len(self.ids) + 1)
+        for i, token_id in enumerate(self.ids):
+            self._prefix[i + 1] = (self._prefix[i] * _HASH_BASE + token_id) % _HASH_MOD
+            self._powers[i + 1] = (self._powers[i] * _HASH_BASE) % _HASH_MOD
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def window(self, start: int, end: int) -> int:
+        """Hash of tokens[start:end]."""
+        power = self._powers[end - start]
+        return (self._prefix[end] - self._prefix[start] * power) % _HASH_MOD
+
+    def shingles(self, n: int) -> set[int]:
+        if len(self.ids) < n:
+            # Too short to judge: identical short replies ("No." "No.") are
+            # usually real speech, not a duplicated transcription.
+            return set()
+        # Every window has the same length, so the power is shared.
+        power = self._powers[n]
+        prefix = self._prefix
+        return {
+            (prefix[i + n] - prefix[i] * power) % _HASH_MOD
+            for i in range(len(self.ids) - n + 1)
+        }
+
+
+def _find_runs(
+    tokens: _Tokens,
+    max_ngram: int,
+    min_repeats: int,
+) -> List[Tuple[int, int, int]]:
+    """
+    Return (start_token, period, repeats) for every back-to-back repetition of
+    a token n-gram (n <= max_ngram) occurring at least 'min_repeats' times.
+
+    Each start position tries at most 'max_ngram' periods and a run is skipped
+    over in one step once found, so this is linear in the number of tokens.
+    """
+    runs: List[Tuple[int, int, int]] = []
+    ids = tokens.ids
+    n = len(tokens)
+    i = 0
+    while i < n:
+        best: Tuple[int, int] | None = None  # (period, repeats)
+        for period in range(1, max_ngram + 1):
+            if i + period * min_repeats > n:
+                break
+            if ids[i] != ids[i + period]:
+                # Cheap reject before hashing: the second copy can't match.
+                continue
+            first = tokens.window(i, i + period)
+            repeats = 1
+            pos = i + period
+            while pos + period <= n and tokens.window(pos, pos + period) == first:
+                repeats += 1
+                pos += period
+            if repeats < min_repeats:
+                continue
+            # Prefer the run that covers the most tokens, then the shortest phrase.
+            if best is None or period * repeats > best[0] * best[1]:
+                best = (period, repeats)
+
+        if best is None:
+            i += 1
+            continue
+
+        period, repeats = best
+        runs.append((i, period, repeats))
+        i += period * repeats
+
+    return runs
+
+
+def detect_repetitions(
+    segments: Iterable[Mapping[str, Any]],
+    *,
+    max_ngram: int = 8,
+    min_repeats: int = 4,
+    shingle_size: int = 3,
+    similarity: float = 0.8,
+) -> RepetitionReport:
+    """
+    Scan slimmed segments ({"text": ..., "speaker": ...}) for whisper
+    repetition loops and near-duplicate adjacent segments.
+
+    - A repetition loop is a phrase of up to 'max_ngram' words repeated
+      back-to-back at least 'min_repeats' times inside one segment.
+    - A near-duplicate is a segment whose word 'shingle_size'-grams overlap the
+      previous segment's with a Jaccard similarity of at least 'similarity',
+      for the same speaker. Segments shorter than 'shingle_size' words are
+      never considered near-duplicates.
+
+    Words are compared case-insensitively and without punctuation. Everything
+    runs in a single pass over the tokens, so long transcripts stay cheap.
+    """
+    if min_repeats < 2:
+        raise ValueError(f"min_repeats must be at least 2; got {min_repeats}")
+
+    report = RepetitionReport()
+    vocab: Dict[str, int] = {}
+
+    prev_speaker: Any = None
+    prev_shingles: set[int] = set()
+    prev_root = -1
+
+    for idx, seg in enumerate(segments):
+        text = str(seg.get("text", "") or "")
+        speaker = seg.get("speaker")
+        tokens = _Tokens(text, vocab)
+
+        for start, period, repeats in _find_runs(tokens, max_ngram, min_repeats):
+            last = start + period * repeats - 1
+            report.runs.append(
+                RepeatedRun(
+                    segment=idx,
+                    start=tokens.spans[start][0],
+                    end=tokens.spans[last][1],
+                    keep_end=tokens.spans[start + period - 1][1],
+                    phrase=text[tokens.spans[start][0] : tokens.spans[start + period - 1][1]],
+                    repeats=repeats,
+                )
+            )
+
+        shingles = tokens.shingles(shingle_size)
+        if not shingles:
+            # Empty or very short segments neither duplicate nor get duplicated.
+            prev_speaker, prev_shingles, prev_root = speaker, set(), -1
+            continue
+
+        root = idx
+        if prev_shingles and speaker == prev_speaker:
+            overlap = len(shingles & prev_shingles)
+            score = overlap / len(shingles | prev_shingles)
+            if score >= similarity:
+                root = prev_root
+                report.duplicates.append(
+                    DuplicateSegment(segment=idx, duplicate_of=root, similarity=score)
+                )
+
+        prev_speaker, prev_shingles, prev_root = speaker, shingles, root
+
+    return report
+
+
+def collapse_text(text: str, runs: Iterable[RepeatedRun]) -> str:
+    """
+    Remove every copy but the first of each repeated run in 'text'.
+    """
+    pieces: List[str] = []
+    pos = 0
+    for run in sorted(runs, key=lambda r: r.start):
+        pieces.append(text[pos : run.keep_end])
+        pos = run.end
+    pieces.append(text[pos:])
+    return "".join(pieces)
+
+
+def collapse_repetitions(
+    segments: Sequence[Mapping[str, Any]],
+    report: RepetitionReport,
+) -> List[Dict[str, Any]]:
+    """
+    Return a copy of slimmed 'segments' with repetition loops collapsed to a
+    single copy and near-duplicate segments dropped.
+    """
+    runs_by_segment: Dict[int, List[RepeatedRun]] = {}
+    for run in report.runs:
+        runs_by_segment.setdefault(run.segment, []).append(run)
+    dropped = {dup.segment for dup in report.duplicates}
+
+    result: List[Dict[str, Any]] = []
+    for idx, seg in enumerate(segments):
+        if idx in dropped:
+            continue
+        new_seg = dict(seg)
+        if idx in runs_by_segment:
+            new_seg["text"] = collapse_text(str(seg.get("text", "")), runs_by_segment[idx])
+        result.append(new_seg)
+    return result
+
+
+def segment_flags(texts: Sequence[str], **kwargs: Any) -> List[str]:
+    """
+    Short per-segment annotations for a single speaker's segments, used to
+    flag suspicious segments while triaging. Empty string means no flag.
+    """
+    report = detect_repetitions(
+        ({"text": text, "speaker": None} for text in texts), **kwargs
+    )
+    flags = [""] * len(texts)
+    for run in report.runs:
+        flags[run.segment] = f"loop x{run.repeats}"
+    for dup in report.duplicates:
+        flags[dup.segment] = f"dup of [{dup.duplicate_of}]"
+    return flags
+
+
+def _is_grouped(segments: Sequence[Any]) -> bool:
+    return any(isinstance(s, Mapping) and isinstance(s.get("segments"), list) for s in segments)
+
+
+def _flatten_groups(groups: Sequence[Any]) -> Tuple[List[Dict[str, Any]], List[Tuple[int, int]]]:
+    flat: List[Dict[str, Any]] = []
+    locations: List[Tuple[int, int]] = []
+    for g_idx, group in enumerate(groups):
+        if not isinstance(group, Mapping):
+            continue
+        for s_idx, text in enumerate(group.get("segments") or []):
+            flat.append({"text": str(text), "speaker": group.get("speaker")})
+            locations.append((g_idx, s_idx))
+    return flat, locations
+
+
+def _load_segments(path: Path) -> List[Any]:
+    with path.open("r", encoding="utf-8") as f:
+        data = json.load(f)
+
+    segments = data.get("segments")
+    if not isinstance(segments, list):
+        raise ValueError(
+            f"Expected top-level key 'segments' containing a list; "
+            f"got {type(segments)!r}"
+        )
+    return segments
+
+
+def describe_report(
+    report: RepetitionReport,
+    locations: Sequence[Tuple[int, int]] | None = None,
+) -> List[str]:
+    """
+    Human-readable lines for a report. 'locations' maps flat segment indices
+    back to (group, segment) pairs for grouped input.
+    """
+
+    def where(idx: int) -> str:
+        if locations is None:
+            return f"segment {idx}"
+        g_idx, s_idx = locations[idx]
+        return f"group {g_idx + 1} segment {s_idx}"
+
+    lines: List[str] = []
+    for run in report.runs:
+        lines.append(f"{where(run.segment)}: {run.phrase!r} repeated {run.repeats} times")
+    for dup in report.duplicates:
+        lines.append(
+            f"{where(dup.segment)}: duplicates {where(dup.duplicate_of)} "
+            f"(similarity {dup.similarity:.2f})"
+        )
+    return lines
+
+
+def detect_repetitions_file(
+    input_path: str | Path,
+    output_path: str | Path | None = None,
+    **kwargs: Any,
+) -> List[str]:
+    """
+    Detect repetitions in a slimmed or grouped JSON file and return report
+    lines. If 'output_path' is given, also write a copy with the repetitions
+    collapsed, in the same (slimmed or grouped) shape as the input.
+    """
+    input_path = Path(input_path)
+    segments = _load_segments(input_path)
+
+    if _is_grouped(segments):
+        flat, locations = _flatten_groups(segments)
+        report = detect_repetitions(flat, **kwargs)
+        lines = describe_report(report, locations)
+        if output_path is None:
+            return lines
+
+        collapsed = collapse_repetitions(flat, report)
+        # Put the surviving segments back into their groups.
+        dropped = {dup.segment for dup in report.duplicates}
+        kept = [loc for idx, loc in enumerate(locations) if idx not in dropped]
+        regrouped: Dict[int, List[str]] = {}
+        for (g_idx, _), seg in zip(kept, collapsed):
+            regrouped.setdefault(g_idx, []).append(seg["text"])
+        result = [
+            {**group, "segments": regrouped[g_idx]}
+            for g_idx, group in enumerate(segments)
+            if g_idx in regrouped
+        ]
+    else:
+        report = detect_repetitions(segments, **kwargs)
+        lines = describe_report(report)
+        if output_path is None:
+            return lines
+        result = collapse_repetitions(segments, report)
+
+    with Path(output_path).open("w", encoding="utf-8") as f:
+        json.dump({"segments": result}, f, ensure_ascii=False, indent=2)
+
+    return lines
+
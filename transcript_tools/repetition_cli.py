@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .repetition import detect_repetitions_file
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="transcript-repeats",
+        description=(
+            "Report whisper repetition loops and near-duplicate adjacent segments "
+            "in a slimmed or grouped transcript JSON, optionally writing a copy "
+            "with them collapsed."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="Path to the slimmed or grouped JSON file.",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="Optional path where a collapsed copy of the JSON will be written.",
+    )
+    parser.add_argument(
+        "--min-repeats",
+        type=int,
+        default=4,
+        help="Back-to-back copies of a phrase needed to count as a loop (default: 4).",
+    )
+    parser.add_argument(
+        "--max-ngram",
+        type=int,
+        default=8,
+        help="Longest phrase, in words, checked for loops (default: 8).",
+    )
+    parser.add_argument(
+        "--similarity",
+        type=float,
+        default=0.8,
+        help=(
+            "Jaccard similarity of word trigrams at which an adjacent segment "
+            "counts as a duplicate (default: 0.8)."
+        ),
+    )
+
+    args = parser.parse_args(argv)
+
+    if args.min_repeats < 2:
+        parser.error("--min-repeats must be at least 2")
+
+    try:
+        lines = detect_repetitions_file(
+            args.input,
+            args.output,
+            max_ngram=args.max_ngram,
+            min_repeats=args.min_repeats,
+            similarity=args.similarity,
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    if not lines:
+        print("No repetitions found.")
+        return
+
+    for line in lines:
+        print(line)
+    print(f"{len(lines)} repetition(s) found.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import re
+import urllib.request
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, List, Mapping, Optional, Sequence, Tuple
+
+from .markdown_export import (
+    group_speaker_and_text,
+    load_groups_from_json,
+    render_markdown_paragraph,
+)
+
+
+DEFAULT_PROMPT = (
+    "You are editing part of an interview transcript written in markdown. "
+    "Fix transcription mistakes, punctuation and grammar without changing the "
+    "meaning. Return only the edited transcript: keep every paragraph, in the "
+    "same order, separated by blank lines, and keep the bold speaker label at "
+    "the start of each paragraph exactly as given."
+)
+
+_LABEL_RE = re.compile(r"^\*\*(.*?)\*\*:\s*")
+_FENCE_RE = re.compile(r"^```[^\n]*\n(.*?)\n```\s*$", re.DOTALL)
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+
+
+@dataclass
+class RevisionConfig:
+    """
+    Settings for revising a transcript against an OpenAI-compatible
+    chat completions endpoint, e.g. 'http://localhost:8080/v1'.
+    """
+
+    endpoint: str
+    model: str
+    prompt: str = DEFAULT_PROMPT
+    max_tokens: int = 2000
+    overlap_tokens: int = 200
+    concurrency: int = 4
+    retries: int = 3
+    timeout: float = 300.0
+    temperature: float = 0.0
+    api_key: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        _check_chunking(self.max_tokens, self.overlap_tokens)
+        if self.concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1; got {self.concurrency}")
+        if self.retries < 0:
+            raise ValueError(f"retries cannot be negative; got {self.retries}")
+
+
+def _check_chunking(max_tokens: int, overlap_tokens: int) -> None:
+    # An overlap of half a chunk or more would make every chunk advance by
+    # only a paragraph or two, resending most of the transcript many times.
+    if max_tokens < 1:
+        raise ValueError(f"max_tokens must be at least 1; got {max_tokens}")
+    if not 0 <= 2 * overlap_tokens < max_tokens:
+        raise ValueError(
+            f"overlap_tokens must be at least 0 and less than half of max_tokens "
+            f"({max_tokens}); got {overlap_tokens}"
+        )
+
+
+@dataclass
+class Paragraph:
+    speaker: str
+    text: str
+
+
+@dataclass
+class Chunk:
+    """
+    A run of consecutive paragraphs [start, end). The first 'overlap'
+    paragraphs are also the last paragraphs of the previous chunk.
+    """
+
+    index: int
+    start: int
+    end: int
+    overlap: int
+    revised: Optional[List[str]] = None
+    errors: List[str] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count (about four characters per token for English), which
+    is all chunking needs.
+    """
+    return max(1, (len(text) + 3) // 4)
+
+
+def paragraphs_from_groups(groups: Sequence[Any]) -> List[Paragraph]:
+    paragraphs: List[Paragraph] = []
+    for group in groups:
+        if not isinstance(group, Mapping):
+            continue
+        speaker, text = group_speaker_and_text(group)
+        rendered = render_markdown_paragraph(speaker, text)
+        if rendered is not None:
+            paragraphs.append(Paragraph(speaker=speaker, text=rendered))
+    return paragraphs
+
+
+def chunk_paragraphs(
+    paragraphs: Sequence[Paragraph],
+    max_tokens: int,
+    overlap_tokens: int,
+) -> List[Chunk]:
+    """
+    Split paragraphs into chunks of at most 'max_tokens' estimated tokens,
+    always on paragraph (group) boundaries. Each chunk after the first starts
+    with up to 'overlap_tokens' worth of the previous chunk's last paragraphs,
+    as context. A single paragraph larger than the budget gets its own chunk.
+
+    'overlap_tokens' must be less than half of 'max_tokens'.
+    """
+    _check_chunking(max_tokens, overlap_tokens)
+    costs = [estimate_tokens(p.text) for p in paragraphs]
+    chunks: List[Chunk] = []
+    start = 0
+    prev_end = 0
+
+    while start < len(paragraphs):
+        end, tokens = start, 0
+        while end < len(paragraphs) and (end == start or tokens + costs[end] <= max_tokens):
+            tokens += costs[end]
+            end += 1
+
+        chunks.append(Chunk(index=len(chunks), start=start, end=end, overlap=prev_end - start))
+        if end >= len(paragraphs):
+            break
+
+        # Back up over the last few paragraphs so the next chunk sees them too,
+        # but always move forward by at least one paragraph.
+        next_start, overlap = end, 0
+        while next_start - 1 > start and overlap + costs[next_start - 1] <= overlap_tokens:
+            next_start -= 1
+            overlap += costs[next_start]
+        start, prev_end = next_start, end
+
+    return chunks
+
+
+def _restore_label(original: Paragraph, revised: str) -> str:
+    """
+    Make sure a revised paragraph keeps the original speaker label, whatever
+    the model did to it.
+    """
+    body = _LABEL_RE.sub("", revised.strip(), count=1)
+    if not original.speaker:
+        return body
+    return f"**{original.speaker}**: {body}" if body else f"**{original.speaker}**:"
+
+
+def parse_revision(paragraphs: Sequence[Paragraph], content: str) -> List[str]:
+    """
+    Split a model response back into paragraphs, one per original paragraph,
+    with the original speaker labels. Raises ValueError if the paragraph count
+    doesn't match, since the overlap can't be resolved reliably then.
+    """
+    content = content.strip()
+    fenced = _FENCE_RE.match(content)
+    if fenced:
+        content = fenced.group(1).strip()
+
+    revised = [p for p in _PARAGRAPH_SPLIT_RE.split(content) if p.strip()]
+    if len(revised) != len(paragraphs):
+        raise ValueError(
+            f"expected {len(paragraphs)} paragraphs in the response, got {len(revised)}"
+        )
+    return [_restore_label(orig, text) for orig, text in zip(paragraphs, revised)]
+
+
+def post_chat_completion(config: RevisionConfig, text: str) -> str:
+    """
+    Blocking call to '<endpoint>/chat/completions'; returns the reply text.
+    """
+    payload = {
+        "model": config.model,
+        "temperature": config.temperature,
+        "messages": [
+            {"role": "system", "content": config.prompt},
+            {"role": "user", "content": text},
+        ],
+    }
+    headers = {"Content-Type": "application/json"}
+    if config.api_key:
+        headers["Authorization"] = f"Bearer {config.api_key}"
+
+    request = urllib.request.Request(
+        config.endpoint.rstrip("/") + "/chat/completions",
+        data=json.dumps(payload).encode("utf-8"),
+        headers=headers,
+        method="POST",
+    )
+    with urllib.request.urlopen(request, timeout=config.timeout) as response:
+        data = json.load(response)
+
+    try:
+        return str(data["choices"][0]["message"]["content"])
+    except (KeyError, IndexError, TypeError) as exc:
+        raise ValueError(f"unexpected response shape: {data!r}") from exc
+
+
+Completer = Callable[[RevisionConfig, str], Awaitable[str]]
+
+
+async def _default_completer(config: RevisionConfig, text: str) -> str:
+    return await asyncio.to_thread(post_chat_completion, config, text)
+
+
+async def _revise_chunk(
+    chunk: Chunk,
+    paragraphs: Sequence[Paragraph],
+    config: RevisionConfig,
+    semaphore: asyncio.Semaphore,
+    complete: Completer,
+) -> None:
+    originals = paragraphs[chunk.start : chunk.end]
+    text = "\n\n".join(p.text for p in originals)
+
+    for attempt in range(config.retries + 1):
+        if attempt:
+            await asyncio.sleep(min(2 ** (attempt - 1), 30))
+        try:
+            async with semaphore:
+                content = await complete(config, text)
+            chunk.revised = parse_revision(originals, content)
+            return
+        except Exception as exc:  # noqa: BLE001
+            chunk.errors.append(f"attempt {attempt + 1}: {exc}")
+
+
+async def revise_chunks(
+    chunks: Sequence[Chunk],
+    paragraphs: Sequence[Paragraph],
+    config: RevisionConfig,
+    complete: Optional[Completer] = None,
+) -> None:
+    """
+    Revise all chunks concurrently (at most 'config.concurrency' requests in
+    flight), retrying each failed chunk up to 'config.retries' times. Results
+    are stored on the chunks.
+    """
+    semaphore = asyncio.Semaphore(max(1, config.concurrency))
+    await asyncio.gather(
+        *(
+            _revise_chunk(chunk, paragraphs, config, semaphore, complete or _default_completer)
+            for chunk in chunks
+        )
+    )
+
+
+def reassemble(chunks: Sequence[Chunk], paragraphs: Sequence[Paragraph]) -> List[str]:
+    """
+    Stitch revised chunks back into one list of paragraphs.
+
+    Where two chunks overlap, the first half of the overlap comes from the
+    earlier chunk and the second half from the later one, so every paragraph
+    is taken from the chunk that saw the most context around it. Chunks that
+    never came back are filled in with the original paragraphs.
+    """
+    # Chunk i owns paragraphs [cut[i], cut[i + 1]).
+    cuts = [0] + [c.start + (c.overlap + 1) // 2 for c in chunks[1:]] + [len(paragraphs)]
+
+    result: List[str] = []
+    for chunk, lo, hi in zip(chunks, cuts, cuts[1:]):
+        if chunk.revised is None:
+            result.extend(p.text for p in paragraphs[lo:hi])
+        else:
+            result.extend(chunk.revised[lo - chunk.start : hi - chunk.start])
+    return result
+
+
+def revise_markdown_from_json(
+    input_path: Path,
+    output_path: Path,
+    config: RevisionConfig,
+    complete: Optional[Completer] = None,
+    allow_partial: bool = False,
+) -> List[Tuple[Chunk, List[str]]]:
+    """
+    Render a triaged/grouped JSON file as markdown (as `transcript-md` does),
+    revise it chunk by chunk, and write the reassembled markdown.
+
+    If a chunk fails every retry, nothing is written unless 'allow_partial'
+    is set, in which case that chunk keeps its original text.
+
+    Returns (chunk, errors) for every chunk that needed retries or failed;
+    failed chunks have 'revised' None.
+    """
+    paragraphs = paragraphs_from_groups(load_groups_from_json(Path(input_path)))
+    chunks = chunk_paragraphs(paragraphs, config.max_tokens, config.overlap_tokens)
+
+    asyncio.run(revise_chunks(chunks, paragraphs, config, complete))
+
+    problems = [(chunk, chunk.errors) for chunk in chunks if chunk.errors]
+    if not allow_partial and any(chunk.revised is None for chunk in chunks):
+        return problems
+
+    markdown = "\n\n".join(reassemble(chunks, paragraphs)).rstrip() + "\n"
+    with Path(output_path).open("w", encoding="utf-8") as f:
+        f.write(markdown)
+
+    return problems
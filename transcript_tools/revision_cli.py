@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Optional
+
+from .revision import DEFAULT_PROMPT, RevisionConfig, revise_markdown_from_json
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        prog="transcript-revise",
+        description=(
+            "Revise a triaged/grouped transcript with an LLM behind an "
+            "OpenAI-compatible endpoint. The transcript is split into chunks on "
+            "speaker boundaries, revised concurrently, and stitched back into "
+            "one markdown file."
+        ),
+    )
+    parser.add_argument(
+        "input",
+        type=Path,
+        help="Path to the triaged/grouped JSON file.",
+    )
+    parser.add_argument(
+        "output",
+        type=Path,
+        help="Path where the revised markdown should be written.",
+    )
+    parser.add_argument(
+        "--endpoint",
+        required=True,
+        help="Base URL of the API, e.g. http://localhost:8080/v1",
+    )
+    parser.add_argument("--model", required=True, help="Model name to request.")
+    parser.add_argument(
+        "--api-key",
+        default=None,
+        help="Optional bearer token for the endpoint.",
+    )
+    parser.add_argument(
+        "--prompt-file",
+        type=Path,
+        default=None,
+        help="Optional file with the system prompt to use instead of the default.",
+    )
+    parser.add_argument(
+        "--max-tokens",
+        type=int,
+        default=2000,
+        help="Approximate token budget per chunk (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--overlap",
+        type=int,
+        default=200,
+        help=(
+            "Approximate tokens of preceding paragraphs repeated at the start of "
+            "each chunk as context; must be less than half of --max-tokens "
+            "(default: %(default)s)."
+        ),
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Maximum requests in flight (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=3,
+        help="Retries per failed chunk (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=300.0,
+        help="Per-request timeout in seconds (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--allow-partial",
+        action="store_true",
+        help=(
+            "Write the output even if some chunks fail every retry, keeping "
+            "their original text. Without this, nothing is written and the "
+            "exit status is 1."
+        ),
+    )
+
+    args = parser.parse_args(argv)
+
+    try:
+        prompt = DEFAULT_PROMPT
+        if args.prompt_file is not None:
+            prompt = args.prompt_file.read_text(encoding="utf-8").strip()
+
+        config = RevisionConfig(
+            endpoint=args.endpoint,
+            model=args.model,
+            prompt=prompt,
+            max_tokens=args.max_tokens,
+            overlap_tokens=args.overlap,
+            concurrency=args.concurrency,
+            retries=args.retries,
+            timeout=args.timeout,
+            api_key=args.api_key,
+        )
+        problems = revise_markdown_from_json(
+            args.input, args.output, config, allow_partial=args.allow_partial
+        )
+    except Exception as exc:  # noqa: BLE001
+        print(f"Error: {exc}", file=sys.stderr)
+        raise SystemExit(1)
+
+    for chunk, errors in problems:
+        status = "kept original text" if chunk.revised is None else "revised after retry"
+        print(f"chunk {chunk.index + 1} ({status}):", file=sys.stderr)
+        for error in errors:
+            print(f"  {error}", file=sys.stderr)
+
+    failed = sum(1 for chunk, _ in problems if chunk.revised is None)
+    if failed and not args.allow_partial:
+        print(
+            f"Error: {failed} chunk(s) could not be revised; nothing was written "
+            f"to {args.output}. Use --allow-partial to keep their original text.",
+            file=sys.stderr,
+        )
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
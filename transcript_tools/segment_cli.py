@@ -41,12 +41,15 @@ def main(argv: Optional[list[str]] = None) -> None:
     parser.add_argument(
         "input",
         type=Path,
-        help="Path to the input JSON file (with top-level 'segments' list).",
+        help=(
+            "Path to the input JSON file (with top-level 'segments' list), or "
+            "'-' to stream NDJSON segments from stdin."
+        ),
     )
     parser.add_argument(
         "output",
         type=Path,
-        help="Path where the output JSON will be written.",
+        help="Path where the output JSON will be written, or '-' for NDJSON on stdout.",
     )
     parser.add_argument(
         "--speaker-map",
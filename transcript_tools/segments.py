@@ -1,8 +1,9 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
-from typing import Any, Dict, Iterable, Mapping, MutableMapping, Optional
+from typing import Any, Dict, Iterable, Iterator, Mapping, MutableMapping, Optional
+
+from .ndjson import RecordWriter, iter_records
 
 
 SpeakerMap = Mapping[str, str]
@@ -70,19 +71,15 @@ def _normalize_speaker_map(raw: Any) -> SpeakerMap:
     )
 
 
-def transform_segments(
+def iter_transformed_segments(
     segments: Iterable[Mapping[str, Any]],
     speaker_map: Optional[SpeakerMap] = None,
-) -> Dict[str, Any]:
+) -> Iterator[Dict[str, Any]]:
     """
-    Transform a list of segments into a new structure where each segment only
-    contains { 'text': ..., 'speaker': ... }.
-
-    If 'speaker_map' is provided, any segment 'speaker' present in the map
-    is replaced by the mapped name.
+    Lazily yield each segment slimmed to { 'text': ..., 'speaker': ... },
+    as described in `transform_segments`.
     """
     speaker_map = speaker_map or {}
-    result_segments = []
 
     for seg in segments:
         text = seg.get("text", "")
@@ -93,14 +90,24 @@ def transform_segments(
         else:
             speaker = raw_speaker
 
-        result_segments.append(
-            {
-                "text": text,
-                "speaker": speaker,
-            }
-        )
+        yield {
+            "text": text,
+            "speaker": speaker,
+        }
+
+
+def transform_segments(
+    segments: Iterable[Mapping[str, Any]],
+    speaker_map: Optional[SpeakerMap] = None,
+) -> Dict[str, Any]:
+    """
+    Transform a list of segments into a new structure where each segment only
+    contains { 'text': ..., 'speaker': ... }.
 
-    return {"segments": result_segments}
+    If 'speaker_map' is provided, any segment 'speaker' present in the map
+    is replaced by the mapped name.
+    """
+    return {"segments": list(iter_transformed_segments(segments, speaker_map))}
 
 
 def transform_segments_file(
@@ -115,27 +122,19 @@ def transform_segments_file(
     Parameters
     ----------
     input_path:
-        Path to the input JSON file containing a top-level 'segments' list.
+        Path to the input JSON file containing a top-level 'segments' list,
+        or '-' to read NDJSON from stdin, one segment per line.
     output_path:
-        Path where the transformed JSON will be written.
+        Path where the transformed JSON will be written, or '-' to write
+        NDJSON to stdout, one segment per line.
     speaker_map_raw:
         Optional raw mapping/array as described in `_normalize_speaker_map`.
-    """
-    input_path = Path(input_path)
-    output_path = Path(output_path)
-
-    with input_path.open("r", encoding="utf-8") as f:
-        data = json.load(f)
-
-    segments = data.get("segments")
-    if not isinstance(segments, list):
-        raise ValueError(
-            f"Expected top-level key 'segments' containing a list; "
-            f"got {type(segments)!r}"
-        )
 
+    Segments are transformed and written one at a time, so with '-' on both
+    ends this runs as a streaming stage of a pipeline.
+    """
     speaker_map = _normalize_speaker_map(speaker_map_raw)
-    transformed = transform_segments(segments, speaker_map=speaker_map)
+    segments = iter_records(input_path)
 
-    with output_path.open("w", encoding="utf-8") as f:
-        json.dump(transformed, f, ensure_ascii=False, indent=2)
+    with RecordWriter(output_path) as writer:
+        writer.write_all(iter_transformed_segments(segments, speaker_map=speaker_map))
@@ -1,9 +1,24 @@
 from __future__ import annotations
 
 import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    MutableSequence,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from .repetition import segment_flags
 
 
 @dataclass
@@ -23,16 +38,19 @@ def load_groups(path: Path) -> List[Group]:
             f"got {type(raw_segments)!r}"
         )
 
-    groups: List[Group] = []
-    for item in raw_segments:
-        if not isinstance(item, dict):
-            continue
-        speaker = str(item.get("speaker", "") or "")
-        segs = item.get("segments") or []
-        if not isinstance(segs, list):
-            raise ValueError("Each group 'segments' field must be a list of strings.")
-        groups.append(Group(speaker=speaker, segments=[str(s) for s in segs]))
-    return groups
+    return [group_from_item(item) for item in raw_segments if isinstance(item, dict)]
+
+
+def group_from_item(item: Dict[str, Any]) -> Group:
+    speaker = str(item.get("speaker", "") or "")
+    segs = item.get("segments") or []
+    if not isinstance(segs, list):
+        raise ValueError("Each group 'segments' field must be a list of strings.")
+    return Group(speaker=speaker, segments=[str(s) for s in segs])
+
+
+def group_to_item(group: Group) -> Dict[str, Any]:
+    return {"speaker": group.speaker, "segments": group.segments}
 
 
 def dump_groups(path: Path, groups: List[Group]) -> None:
@@ -42,7 +60,7 @@ def dump_groups(path: Path, groups: List[Group]) -> None:
     """
     payload = {
         "segments": [
-            {"speaker": g.speaker, "segments": g.segments}
+            group_to_item(g)
             for g in groups
             if g.segments
         ]
@@ -51,26 +69,90 @@ def dump_groups(path: Path, groups: List[Group]) -> None:
         json.dump(payload, f, ensure_ascii=False, indent=2)
 
 
-def _print_group(label: str, group: Optional[Group]) -> None:
-    print(f"{label}:")
-    if group is None:
-        print("  <none>")
-        return
+T = TypeVar("T")
+
+# Groups after the current one whose windows are rendered in the background.
+PREFETCH_GROUPS = 3
+
 
-    print(f"  speaker: {group.speaker!r}")
-    print("  segments:")
+class _GroupCache(Generic[T]):
+    """
+    Values computed from a group, keyed by the group object rather than its
+    list index (indices shift whenever groups are split or removed). An entry
+    is only used while the group's speaker and segments are unchanged, so
+    in-place edits never need explicit invalidation. Thread-safe; least
+    recently used entries are dropped beyond 'maxsize'.
+    """
+
+    def __init__(self, compute: Callable[[Group], T], maxsize: int) -> None:
+        self._compute = compute
+        self._maxsize = maxsize
+        self._entries: OrderedDict[int, Tuple[Tuple[str, Tuple[str, ...]], T]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, group: Group) -> T:
+        snapshot = (group.speaker, tuple(group.segments))
+        key = id(group)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == snapshot:
+                self._entries.move_to_end(key)
+                return entry[1]
+
+        # Compute from the snapshot, so a concurrent edit can't produce a value
+        # that doesn't match what's stored alongside it.
+        value = self._compute(Group(speaker=snapshot[0], segments=list(snapshot[1])))
+        with self._lock:
+            self._entries[key] = (snapshot, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def warm(self, groups: List[Group]) -> None:
+        for group in groups:
+            self.get(group)
+
+
+def _render_group_lines(group: Group) -> List[str]:
+    lines = [f"  speaker: {group.speaker!r}", "  segments:"]
     if not group.segments:
-        print("    <no segments>")
-        return
+        lines.append("    <no segments>")
+        return lines
 
+    # Flag whisper repetition loops and duplicated segments for the reader.
+    flags = segment_flags(group.segments)
     for idx, seg in enumerate(group.segments):
         text = seg.replace("\n", " ").strip()
         if len(text) > 160:
             text = text[:157] + "..."
-        print(f"    [{idx}] {text}")
+        flag = f"({flags[idx]}) " if flags[idx] else ""
+        lines.append(f"    [{idx}] {flag}{text}")
+    return lines
 
 
-def _print_group_window(groups: List[Group], group_idx: int) -> None:
+def group_search_text(group: Group) -> str:
+    """
+    What jump queries are matched against: the speaker on one line, then the
+    segments with all whitespace collapsed to single spaces, lowercased.
+    """
+    segments = " ".join(" ".join(seg.split()) for seg in group.segments)
+    return f"{group.speaker}\n{segments}".lower()
+
+
+_render_cache: _GroupCache[List[str]] = _GroupCache(_render_group_lines, maxsize=256)
+
+
+def _print_group(label: str, group: Optional[Group]) -> None:
+    print(f"{label}:")
+    if group is None:
+        print("  <none>")
+        return
+
+    print("\n".join(_render_cache.get(group)))
+
+
+def _print_group_window(groups: MutableSequence[Group], group_idx: int) -> None:
     preceding = groups[group_idx - 1] if group_idx > 0 else None
     active = groups[group_idx]
     following = groups[group_idx + 1] if group_idx + 1 < len(groups) else None
@@ -85,7 +167,7 @@ def _print_group_window(groups: List[Group], group_idx: int) -> None:
 
 
 def _print_context_with_active_segment(
-    groups: List[Group],
+    groups: MutableSequence[Group],
     group_idx: int,
     segment_idx: int,
 ) -> None:
@@ -108,20 +190,108 @@ def _prompt_group_decision() -> str:
 
     - y: modify group segmentation
     - n: skip this group, no changes
+    - j: jump to another group, by number or text
     - w: write remaining groups without further triage
     - q: quit without writing any output
     """
     while True:
         answer = input(
             "modify group segmentation? (y/n) "
+            "jump to group? (j) "
             "write remaining without further changes? (w) "
             "quit? (q) "
         ).strip().lower()
 
-        if answer in ("y", "n", "w", "q"):
+        if answer in ("y", "n", "j", "w", "q"):
             return answer
 
-        print("Please enter one of: y, n, w, q.")
+        print("Please enter one of: y, n, j, w, q.")
+
+
+class GroupSearch:
+    """
+    Text search over a sequence of groups, keyed by position.
+
+    For a plain list the search text of each position is computed when a
+    query first needs it and kept until `invalidate` says an edit may have
+    changed it, so repeated jumps are a scan over ready strings. A sequence
+    with its own `find_text` (LazyGroups, which searches the raw file bytes
+    instead of parsing every group) is searched through that.
+    """
+
+    def __init__(self, groups: MutableSequence[Group]) -> None:
+        self._groups = groups
+        self._find_text: Optional[Callable[[str, int], Optional[int]]] = getattr(
+            groups, "find_text", None
+        )
+        self._texts: List[Optional[str]] = (
+            [] if self._find_text is not None else [None] * len(groups)
+        )
+
+    def invalidate(self, start: int, stop: int, shift: int) -> None:
+        """
+        Forget positions [start, stop), which now span 'shift' more groups.
+        """
+        if self._find_text is not None:
+            return
+        start = max(0, start)
+        stop = min(stop, len(self._texts))
+        self._texts[start:stop] = [None] * max(0, stop - start + shift)
+
+    def _text(self, idx: int) -> str:
+        text = self._texts[idx]
+        if text is None:
+            text = self._texts[idx] = group_search_text(self._groups[idx])
+        return text
+
+    def find(self, query: str, current: int = -1) -> Optional[int]:
+        """
+        0-based index of the group 'query' refers to: a 1-based group number,
+        or otherwise the first group after 'current' (wrapping around) whose
+        speaker or text contains the query, ignoring case and line breaks.
+        """
+        query = " ".join(query.split())
+        total = len(self._groups)
+        if not query or not total:
+            return None
+        if query.isdigit():
+            number = int(query)
+            return number - 1 if 1 <= number <= total else None
+
+        needle = query.lower()
+        if self._find_text is not None:
+            return self._find_text(needle, current)
+        for idx in [*range(current + 1, total), *range(0, min(current + 1, total))]:
+            if needle in self._text(idx):
+                return idx
+        return None
+
+
+def _prompt_jump(search: GroupSearch, current: int) -> Optional[int]:
+    query = input("jump to (group number or text)? ")
+    idx = search.find(query, current)
+    if idx is None:
+        print(f"No group matches {query.strip()!r}.")
+    return idx
+
+
+def _prefetch(
+    pool: ThreadPoolExecutor,
+    pending: Optional[Future[None]],
+    groups: MutableSequence[Group],
+    group_idx: int,
+) -> Future[None]:
+    """
+    Render the windows of the next PREFETCH_GROUPS groups in the background
+    while the user reads the current one. The groups themselves are fetched
+    here, on the main thread, since the sequence (e.g. LazyGroups) needn't be
+    thread-safe.
+    """
+    if pending is not None:
+        pending.cancel()
+    end = min(len(groups), group_idx + PREFETCH_GROUPS + 2)
+    upcoming = [groups[i] for i in range(group_idx + 1, end)]
+    return pool.submit(_render_cache.warm, upcoming)
 
 
 def _prompt_action() -> str:
@@ -170,7 +340,7 @@ def _prompt_speaker_name() -> str:
         print("Speaker name cannot be empty.")
 
 
-def _triage_single_group(groups: List[Group], group_idx: int) -> int:
+def _triage_single_group(groups: MutableSequence[Group], group_idx: int) -> int:
     """
     Interactively triage a single group, possibly moving segments to the
     preceding/following groups, creating new groups, deleting segments,
@@ -287,7 +457,11 @@ def _triage_single_group(groups: List[Group], group_idx: int) -> int:
     return next_group_idx
 
 
-def run_triage(groups: List[Group], start_group: int = 1) -> bool:
+def run_triage(
+    groups: MutableSequence[Group],
+    start_group: int = 1,
+    jump: Optional[str] = None,
+) -> bool:
     """
     Main triage loop. Walks through groups and gives you the chance to
     adjust segmentation on each one.
@@ -299,6 +473,8 @@ def run_triage(groups: List[Group], start_group: int = 1) -> bool:
     start_group:
         1-based index of the group at which to start triage. Defaults to 1
         (the first group).
+    jump:
+        Start at the group this refers to instead (see `GroupSearch.find`).
 
     Returns
     -------
@@ -324,10 +500,34 @@ def run_triage(groups: List[Group], start_group: int = 1) -> bool:
     # Convert to 0-based index.
     group_idx = start_group - 1
 
+    search = GroupSearch(groups)
+    if jump is not None:
+        found = search.find(jump)
+        if found is None:
+            print(f"No group matches {jump!r}. Nothing to triage.")
+            return True
+        group_idx = found
+
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="triage-prefetch")
+    try:
+        return _triage_loop(groups, group_idx, pool, search)
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _triage_loop(
+    groups: MutableSequence[Group],
+    group_idx: int,
+    pool: ThreadPoolExecutor,
+    search: GroupSearch,
+) -> bool:
+    prefetch: Optional[Future[None]] = None
+
     while group_idx < len(groups):
         print("\n" + "=" * 80)
         print(f"Group {group_idx + 1} of {len(groups)}")
         _print_group_window(groups, group_idx)
+        prefetch = _prefetch(pool, prefetch, groups, group_idx)
 
         decision = _prompt_group_decision()
 
@@ -338,10 +538,21 @@ def run_triage(groups: List[Group], start_group: int = 1) -> bool:
 
         if decision == "y":
             # Enter per-segment triage for this group.
-            group_idx = _triage_single_group(groups, group_idx)
+            before = len(groups)
+            edited = group_idx
+            group_idx = _triage_single_group(groups, edited)
+            # Edits only touch the group and its neighbours, plus any groups
+            # split off in between.
+            search.invalidate(edited - 1, edited + 2, len(groups) - before)
             # After triage, loop continues from the returned group index.
             continue
 
+        if decision == "j":
+            found = _prompt_jump(search, group_idx)
+            if found is not None:
+                group_idx = found
+            continue
+
         if decision == "w":
             # Write remaining without further changes:
             # just stop triaging and let the caller write out the current state.
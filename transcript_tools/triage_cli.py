@@ -5,9 +5,39 @@ import sys
 from pathlib import Path
 from typing import Optional
 
+from .corpus import CorpusIndex, Fingerprint, describe_matches, fingerprint_file
+from .group_index import LazyGroups
 from .triage import load_groups, dump_groups, run_triage
 
 
+def _check_corpus(index_path: Path, input_path: Path) -> Optional[Fingerprint]:
+    """
+    Report near-duplicates of the input already in the corpus index and ask
+    whether to go on. Returns the input's fingerprint if so, None otherwise.
+    """
+    fp = fingerprint_file(input_path)
+
+    with CorpusIndex(index_path) as index:
+        lines = describe_matches(*index.query(fp, exclude=str(input_path.resolve())))
+    if lines:
+        print("This transcript overlaps with transcripts already in the corpus:")
+        for line in lines:
+            print(f"  {line}")
+        while True:
+            answer = input("continue triage? (y/n) ").strip().lower()
+            if answer in ("y", "n"):
+                break
+            print("Please enter one of: y, n.")
+        if answer == "n":
+            return None
+    return fp
+
+
+def _add_to_corpus(index_path: Path, input_path: Path, fp: Fingerprint) -> None:
+    with CorpusIndex(index_path) as index:
+        index.add(str(input_path.resolve()), fp)
+
+
 def main(argv: Optional[list[str]] = None) -> None:
     parser = argparse.ArgumentParser(
         prog="transcript-triage",
@@ -36,17 +66,72 @@ def main(argv: Optional[list[str]] = None) -> None:
         ),
     )
 
+    parser.add_argument(
+        "--jump",
+        default=None,
+        metavar="QUERY",
+        help=(
+            "Start at this group number, or at the first group whose speaker or "
+            "text contains QUERY (case-insensitive), instead of --start-group."
+        ),
+    )
+
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help=(
+            "Only parse the groups around the one being triaged, using a cached "
+            "byte-offset index (<input>.idx). Useful when resuming deep into a "
+            "very large file."
+        ),
+    )
+
+    parser.add_argument(
+        "--corpus",
+        type=Path,
+        default=None,
+        metavar="INDEX",
+        help=(
+            "Before triage, check the input for near-duplicate episodes and "
+            "shared passages in this corpus index (see transcript-corpus). "
+            "Once the triaged output is written, the input is added to the index."
+        ),
+    )
+
     args = parser.parse_args(argv)
 
     try:
-        groups = load_groups(args.input)
-        should_write = run_triage(groups, start_group=args.start_group)
+        fp: Optional[Fingerprint] = None
+        if args.corpus is not None:
+            fp = _check_corpus(args.corpus, args.input)
+            if fp is None:
+                print("Quitting without writing any changes.")
+                return
+
+        if args.lazy:
+            lazy_groups = LazyGroups(args.input)
+            should_write = run_triage(
+                lazy_groups, start_group=args.start_group, jump=args.jump
+            )
+
+            if not should_write:
+                lazy_groups.close()
+                print("Quitting without writing any changes.")
+                return
+
+            lazy_groups.dump(args.output)
+        else:
+            groups = load_groups(args.input)
+            should_write = run_triage(groups, start_group=args.start_group, jump=args.jump)
+
+            if not should_write:
+                print("Quitting without writing any changes.")
+                return
 
-        if not should_write:
-            print("Quitting without writing any changes.")
-            return
+            dump_groups(args.output, groups)
 
-        dump_groups(args.output, groups)
+        if fp is not None:
+            _add_to_corpus(args.corpus, args.input, fp)
 
     except Exception as exc:  # noqa: BLE001
         print(f"Error: {exc}", file=sys.stderr)